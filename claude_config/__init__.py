@@ -2,27 +2,47 @@
 Claude Config - Claude Code를 나에게 맞게 튜닝하는 도구
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "0.2.0"
 
-from claude_config.log_analyzer import LogAnalyzer, Conversation, Message
-from claude_config.pattern_extractor import PatternExtractor, Pattern
-from claude_config.claude_md_updater import ClaudeMdUpdater, UpdateSuggestion
-from claude_config.config_generator import ConfigGenerator
-from claude_config.hooks_manager import HooksManager, Hook, HOOK_TEMPLATES
-from claude_config.handoff_generator import HandoffGenerator, HandoffContext
-
-__all__ = [
-    "LogAnalyzer",
-    "Conversation",
-    "Message",
-    "PatternExtractor",
-    "Pattern",
-    "ClaudeMdUpdater",
-    "UpdateSuggestion",
-    "ConfigGenerator",
-    "HooksManager",
-    "Hook",
-    "HOOK_TEMPLATES",
-    "HandoffGenerator",
-    "HandoffContext",
-]
+if TYPE_CHECKING:
+    from claude_config.log_analyzer import LogAnalyzer, Conversation, Message
+    from claude_config.pattern_extractor import PatternExtractor, Pattern
+    from claude_config.claude_md_updater import ClaudeMdUpdater, UpdateSuggestion
+    from claude_config.config_generator import ConfigGenerator
+    from claude_config.hooks_manager import HooksManager, Hook, HOOK_TEMPLATES
+    from claude_config.handoff_generator import HandoffGenerator, HandoffContext
+
+# 공개 이름 -> 모듈. 처음 접근할 때 import (CLI 시작 시 모든 모듈을 읽지 않도록)
+_EXPORTS = {
+    "LogAnalyzer": "claude_config.log_analyzer",
+    "Conversation": "claude_config.log_analyzer",
+    "Message": "claude_config.log_analyzer",
+    "PatternExtractor": "claude_config.pattern_extractor",
+    "Pattern": "claude_config.pattern_extractor",
+    "ClaudeMdUpdater": "claude_config.claude_md_updater",
+    "UpdateSuggestion": "claude_config.claude_md_updater",
+    "ConfigGenerator": "claude_config.config_generator",
+    "HooksManager": "claude_config.hooks_manager",
+    "Hook": "claude_config.hooks_manager",
+    "HOOK_TEMPLATES": "claude_config.hooks_manager",
+    "HandoffGenerator": "claude_config.handoff_generator",
+    "HandoffContext": "claude_config.handoff_generator",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # 다음부터는 바로 조회
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_EXPORTS])
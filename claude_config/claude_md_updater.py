@@ -4,11 +4,54 @@ CLAUDE.md 업데이터
 """
 
 import re
+import time
+from collections import Counter
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from datetime import datetime
 from typing import Optional
 from dataclasses import dataclass
-from collections import Counter
+
+from claude_config.file_utils import atomic_write_text
+
+
+# 섹션 이름 -> (한글 헤더, 영문 헤더). 섹션을 추가할 때는 여기만 수정
+_SECTION_TITLES = {
+    "permanent": ("영구 규칙", "Permanent"),
+    "validated": ("검증된 패턴", "Validated"),
+    "recent": ("최근 학습", "Recent"),
+    "deprecated": ("폐기 예정", "Deprecated"),
+}
+
+
+def _title_pattern(title: str) -> str:
+    """헤더 제목을 공백 수에 관계없이 매칭하는 패턴으로 변환"""
+    return r"\s*".join(re.escape(word) for word in title.split())
+
+
+# 섹션 헤더 패턴 (한 줄당 한 번만 매칭하도록 named group 으로 합침)
+_SECTION_RE = re.compile(
+    r"#\s*(?:"
+    + "|".join(
+        f"(?P<{name}>{_title_pattern(ko)}|{_title_pattern(en)})"
+        for name, (ko, en) in _SECTION_TITLES.items()
+    )
+    + ")",
+    re.IGNORECASE,
+)
+
+# 섹션이 없는 파일에 제안을 추가할 때 쓰는 헤더
+_SECTION_HEADERS = {name: f"# {ko} ({en})" for name, (ko, en) in _SECTION_TITLES.items()}
+
+# 중복 판단용 키워드 (한글 2자 이상, 영문 3자 이상)
+_TOKEN_RE = re.compile(r'[가-힣]{2,}|[a-zA-Z]{3,}')
+
+
+def count_tone_corrections(corrections: list[dict]) -> int:
+    """말투(반말/존댓말) 관련 교정 횟수"""
+    return sum(
+        1 for c in corrections
+        if "반말" in c.get("keyword", "") or "존댓말" in c.get("keyword", "")
+    )
 
 
 @dataclass
@@ -27,86 +70,106 @@ class ClaudeMdUpdater:
             # 기본 경로: 현재 프로젝트의 CLAUDE.md
             self.claude_md_path = Path.cwd() / "CLAUDE.md"
 
+        # (mtime_ns, size, 내용) - 파일이 바뀌지 않았으면 다시 읽지 않음
+        self._cache: Optional[tuple[int, int, str]] = None
+
     def read_claude_md(self) -> str:
         """CLAUDE.md 파일 읽기"""
-        if self.claude_md_path.exists():
-            return self.claude_md_path.read_text(encoding='utf-8')
-        return ""
+        try:
+            st = self.claude_md_path.stat()
+        except FileNotFoundError:
+            self._cache = None
+            return ""
+
+        if self._cache and self._cache[:2] == (st.st_mtime_ns, st.st_size):
+            return self._cache[2]
+
+        content = self.claude_md_path.read_text(encoding='utf-8')
+        self._cache = (st.st_mtime_ns, st.st_size, content)
+        return content
 
     def parse_sections(self, content: str) -> dict:
         """CLAUDE.md를 섹션별로 파싱"""
-        sections = {
-            "permanent": "",
-            "validated": "",
-            "recent": "",
-            "deprecated": "",
-            "other": ""
-        }
-
-        # 섹션 헤더 패턴
-        section_patterns = {
-            "permanent": r"#\s*영구\s*규칙|#\s*Permanent",
-            "validated": r"#\s*검증된\s*패턴|#\s*Validated",
-            "recent": r"#\s*최근\s*학습|#\s*Recent",
-            "deprecated": r"#\s*폐기\s*예정|#\s*Deprecated",
-        }
-
-        current_section = "other"
-        current_content = []
-
-        for line in content.split('\n'):
-            # 새 섹션 시작 확인
-            found_section = False
-            for section_name, pattern in section_patterns.items():
-                if re.search(pattern, line, re.IGNORECASE):
-                    # 이전 섹션 저장
-                    sections[current_section] += '\n'.join(current_content)
-                    current_section = section_name
-                    current_content = [line]
-                    found_section = True
-                    break
-
-            if not found_section:
-                current_content.append(line)
-
-        # 마지막 섹션 저장
-        sections[current_section] += '\n'.join(current_content)
+        return self._collect_sections(content, self._section_spans(content))
+
+    def _section_spans(self, content: str) -> list[tuple[str, int, int]]:
+        """섹션별 (섹션 이름, 시작 오프셋, 끝 오프셋) 목록"""
+        # '#'이 들어 있는 줄만 후보로 보고 정규식은 그 줄에만 적용
+        section_starts = [("other", 0)]
+        pos = content.find('#')
+        while pos != -1:
+            line_start = content.rfind('\n', 0, pos) + 1
+            line_end = content.find('\n', pos)
+            if line_end == -1:
+                line_end = len(content)
+
+            match = _SECTION_RE.search(content, line_start, line_end)
+            if match:
+                section_starts.append((match.lastgroup, line_start))
+            pos = content.find('#', line_end)
+
+        section_ends = [start for _, start in section_starts[1:]] + [len(content)]
+        return [(name, start, end) for (name, start), end in zip(section_starts, section_ends)]
+
+    def _collect_sections(self, content: str, spans: list[tuple[str, int, int]]) -> dict:
+        """섹션 범위를 잘라서 섹션별 내용으로 합치기"""
+        sections = {name: "" for name in _SECTION_TITLES}
+        sections["other"] = ""
+
+        for section_name, start, end in spans:
+            sections[section_name] += content[start:end]
 
         return sections
 
     def check_duplicate_rule(self, existing_content: str, new_rule: str) -> bool:
         """중복 규칙 확인"""
-        # 핵심 키워드 추출 (명사, 동사 등)
-        keywords = re.findall(r'[가-힣]{2,}|[a-zA-Z]{3,}', new_rule.lower())
-
+        existing_prefixes = self._keyword_prefixes(self._keywords(existing_content))
+        return self._is_duplicate(existing_prefixes, self._keywords(new_rule))
+
+    def _keywords(self, text: str) -> set[str]:
+        """핵심 키워드 추출 (명사, 동사 등)"""
+        return set(_TOKEN_RE.findall(text.lower()))
+
+    def _keyword_prefixes(self, keywords: set[str]) -> set[str]:
+        """키워드와 그 접두어 집합 - 조사/어미가 붙은 단어도 매칭되도록"""
+        prefixes = set()
+        for keyword in keywords:
+            for end in range(2, len(keyword) + 1):
+                prefixes.add(keyword[:end])
+        return prefixes
+
+    def _is_duplicate(self, existing_prefixes: set[str], keywords: set[str]) -> bool:
+        """기존 키워드 집합과 비교하여 중복 여부 판단"""
         # 기존 내용에 유사한 키워드가 많이 있으면 중복으로 판단
-        existing_lower = existing_content.lower()
-        match_count = sum(1 for kw in keywords if kw in existing_lower)
+        # 짧은 규칙을 긴 섹션 전체와 비교하므로 Jaccard(합집합 기준) 대신
+        # 새 규칙 키워드의 포함률을 사용 (섹션이 길어져도 값이 작아지지 않음)
+        match_count = len(keywords & existing_prefixes)
 
         return match_count >= len(keywords) * 0.7  # 70% 이상 일치하면 중복
 
-    def generate_suggestions(self, patterns: dict) -> list[UpdateSuggestion]:
+    def generate_suggestions(self, patterns: dict, today: Optional[str] = None) -> list[UpdateSuggestion]:
         """패턴 분석 결과에서 업데이트 제안 생성"""
         suggestions = []
-        today = datetime.now().strftime("%Y-%m-%d")
+        if today is None:
+            today = time.strftime("%Y-%m-%d")
 
         # 교정 패턴에서 제안 생성
         corrections = patterns.get("corrections", [])
         if len(corrections) >= 2:
             # 말투 관련 교정
-            tone_corrections = [c for c in corrections if "반말" in c.get("keyword", "") or "존댓말" in c.get("keyword", "")]
-            if tone_corrections:
+            tone_count = count_tone_corrections(corrections)
+            if tone_count:
                 suggestions.append(UpdateSuggestion(
                     section="permanent",
                     content=f"### [{today}] 말투 규칙\n- 항상 존댓말 사용\n- 반말 사용 금지\n",
-                    reason=f"말투 관련 교정 {len(tone_corrections)}회 감지",
+                    reason=f"말투 관련 교정 {tone_count}회 감지",
                     priority=1
                 ))
 
         # 반복 요청에서 제안 생성
         requests = patterns.get("repeated_requests", {})
         if requests:
-            top_request = max(requests.items(), key=lambda x: x[1])
+            top_request = max(requests.items(), key=itemgetter(1))
             if top_request[1] >= 5:
                 suggestions.append(UpdateSuggestion(
                     section="recent",
@@ -119,7 +182,7 @@ class ClaudeMdUpdater:
         edit_patterns = patterns.get("edit_patterns", {})
         by_extension = edit_patterns.get("by_extension", {})
         if by_extension:
-            primary_ext = max(by_extension.items(), key=lambda x: x[1])
+            primary_ext = max(by_extension.items(), key=itemgetter(1))
             if primary_ext[1] >= 10:
                 suggestions.append(UpdateSuggestion(
                     section="recent",
@@ -132,18 +195,18 @@ class ClaudeMdUpdater:
         workflows = patterns.get("workflows", [])
         if workflows:
             # 자주 나타나는 도구 시퀀스 찾기
-            sequences = []
+            # 인접한 도구 쌍을 튜플로 세고, 상위 3개만 문자열로 변환
+            pair_counts = Counter()
             for wf in workflows:
                 seq = wf.get("sequence", [])
-                if len(seq) >= 2:
-                    for i in range(len(seq) - 1):
-                        sequences.append(f"{seq[i]} → {seq[i+1]}")
+                pair_counts.update(zip(seq, seq[1:]))
 
-            common_sequences = Counter(sequences).most_common(3)
+            common_sequences = pair_counts.most_common(3)
             if common_sequences and common_sequences[0][1] >= 3:
-                workflow_content = f"### [{today}] 작업 패턴\n"
-                for seq, count in common_sequences:
-                    workflow_content += f"- {seq}: {count}회\n"
+                workflow_content = f"### [{today}] 작업 패턴\n" + "".join(
+                    f"- {first} → {second}: {count}회\n"
+                    for (first, second), count in common_sequences
+                )
 
                 suggestions.append(UpdateSuggestion(
                     section="recent",
@@ -152,23 +215,11 @@ class ClaudeMdUpdater:
                     priority=2
                 ))
 
-        return sorted(suggestions, key=lambda x: x.priority)
+        return sorted(suggestions, key=attrgetter("priority"))
 
     def apply_suggestions(self, suggestions: list[UpdateSuggestion], dry_run: bool = True) -> str:
         """제안을 CLAUDE.md에 적용"""
         content = self.read_claude_md()
-        sections = self.parse_sections(content)
-
-        for suggestion in suggestions:
-            section = suggestion.section
-            if section in sections:
-                # 중복 확인
-                if not self.check_duplicate_rule(sections[section], suggestion.content):
-                    # 섹션 끝에 추가
-                    sections[section] += f"\n{suggestion.content}"
-
-        # 섹션 재조합
-        new_content = content
 
         if dry_run:
             print("\n=== CLAUDE.md 업데이트 미리보기 ===\n")
@@ -177,32 +228,113 @@ class ClaudeMdUpdater:
                 print(f"  이유: {suggestion.reason}")
                 print(f"  내용:\n{suggestion.content}")
                 print()
-            return new_content
+            return content
+
+        spans = self._section_spans(content)
+        sections = self._collect_sections(content, spans)
+
+        # 섹션별 키워드는 한 번만 추출하고 추가된 제안만 반영
+        section_keywords = {}
+        additions = {}
+        for suggestion in suggestions:
+            section = suggestion.section
+            if section in sections:
+                if section not in section_keywords:
+                    section_keywords[section] = self._keyword_prefixes(
+                        self._keywords(sections[section])
+                    )
+
+                # 중복 확인 (제안 내용도 한 번만 소문자화/토큰화)
+                keywords = self._keywords(suggestion.content)
+                if not self._is_duplicate(section_keywords[section], keywords):
+                    additions.setdefault(section, []).append(suggestion.content)
+                    section_keywords[section] |= self._keyword_prefixes(keywords)
+
+        # 섹션 재조합: 각 섹션의 마지막 위치 끝에 추가
+        new_content = self._insert_additions(content, spans, additions)
 
         # 실제 적용
-        self.claude_md_path.write_text(new_content, encoding='utf-8')
+        if atomic_write_text(self.claude_md_path, new_content):
+            self._cache = None
         return new_content
 
+    def _insert_additions(
+        self,
+        content: str,
+        spans: list[tuple[str, int, int]],
+        additions: dict[str, list[str]]
+    ) -> str:
+        """섹션 끝에 추가할 내용을 끼워 넣은 새 문서 생성"""
+        section_spans = {name: (start, end) for name, start, end in spans}
+
+        inserts = []
+        missing = []
+        for section, items in additions.items():
+            block = "".join(f"\n{item.rstrip()}\n" for item in items)
+            if section in section_spans:
+                inserts.append(self._insertion_point(content, *section_spans[section]) + (block,))
+            else:
+                # 파일에 없는 섹션은 헤더와 함께 맨 끝에 추가
+                missing.append(f"\n{_SECTION_HEADERS[section]}\n{block}")
+
+        parts = []
+        prev = 0
+        for pos, prefix, block in sorted(inserts, key=itemgetter(0)):
+            parts.append(content[prev:pos])
+            parts.append(prefix + block)
+            prev = pos
+        parts.append(content[prev:])
+        new_content = "".join(parts)
+
+        if missing:
+            if not new_content:
+                return "".join(missing).lstrip("\n")
+            if not new_content.endswith("\n"):
+                new_content += "\n"
+            new_content += "".join(missing)
+
+        return new_content
+
+    def _insertion_point(self, content: str, start: int, end: int) -> tuple[int, str]:
+        """섹션 안에서 마지막 내용 줄 바로 뒤 위치 (뒤쪽 빈 줄과 '---' 구분선 앞)"""
+        pos = end
+        while pos > start:
+            line_start = content.rfind('\n', start, pos - 1) + 1
+            if line_start <= start:
+                line_start = start
+            if content[line_start:pos].strip() not in ("", "---"):
+                break
+            pos = line_start
+
+        if pos > start and content[pos - 1] != '\n':
+            return pos, "\n"
+        return pos, ""
+
     def get_update_report(self, patterns: dict) -> str:
         """업데이트 리포트 생성"""
-        suggestions = self.generate_suggestions(patterns)
+        now = time.localtime()
+        suggestions = self.generate_suggestions(patterns, today=time.strftime("%Y-%m-%d", now))
 
-        report = "# CLAUDE.md 업데이트 리포트\n\n"
-        report += f"생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        parts = [
+            "# CLAUDE.md 업데이트 리포트\n\n",
+            f"생성 시간: {time.strftime('%Y-%m-%d %H:%M:%S', now)}\n\n",
+        ]
 
         if not suggestions:
-            report += "새로운 업데이트 제안이 없습니다.\n"
-            return report
+            parts.append("새로운 업데이트 제안이 없습니다.\n")
+            return "".join(parts)
 
-        report += f"## 제안 사항 ({len(suggestions)}건)\n\n"
+        parts.append(f"## 제안 사항 ({len(suggestions)}건)\n\n")
 
         for i, suggestion in enumerate(suggestions, 1):
             priority_label = {1: "높음", 2: "중간", 3: "낮음"}.get(suggestion.priority, "")
-            report += f"### {i}. [{priority_label}] {suggestion.reason}\n\n"
-            report += f"**섹션**: {suggestion.section}\n\n"
-            report += f"**제안 내용**:\n```markdown\n{suggestion.content}\n```\n\n"
+            parts.append(
+                f"### {i}. [{priority_label}] {suggestion.reason}\n\n"
+                f"**섹션**: {suggestion.section}\n\n"
+                f"**제안 내용**:\n```markdown\n{suggestion.content}\n```\n\n"
+            )
 
-        return report
+        return "".join(parts)
 
 
 if __name__ == "__main__":
@@ -3,68 +3,222 @@ CLAUDE.md 설정 생성기
 대화형 질문 + 로그 분석으로 맞춤형 CLAUDE.md 생성
 """
 
+import functools
+import heapq
+import os
+import time
+from operator import itemgetter
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+from claude_config.claude_md_updater import count_tone_corrections
+from claude_config.file_utils import atomic_write_text, is_unchanged, json_loads
+
+if TYPE_CHECKING:
+    from claude_config.log_analyzer import LogAnalyzer
+    from claude_config.pattern_extractor import PatternExtractor
+
+
+# 언어/프레임워크 감지 규칙: (마커 파일, 언어, 프레임워크)
+_DETECTIONS: tuple[tuple[str, str, tuple[str, ...]], ...] = (
+    ("package.json", "JavaScript/TypeScript", ("Node.js",)),
+    ("tsconfig.json", "TypeScript", ()),
+    ("pyproject.toml", "Python", ()),
+    ("requirements.txt", "Python", ()),
+    ("go.mod", "Go", ()),
+    ("Cargo.toml", "Rust", ()),
+    ("pom.xml", "Java", ("Maven",)),
+    ("build.gradle", "Java/Kotlin", ("Gradle",)),
+    ("Gemfile", "Ruby", ()),
+    ("composer.json", "PHP", ()),
+    ("pubspec.yaml", "Dart", ("Flutter",)),
+)
+
+# package.json 의존성 이름 -> 프레임워크
+_JS_FRAMEWORKS: tuple[tuple[str, str], ...] = (
+    ("react", "React"),
+    ("next", "Next.js"),
+    ("vue", "Vue"),
+    ("express", "Express"),
+)
+
+# 말투 선택 -> 규칙 문장
+_TONE_LINES: dict[str, str] = {
+    "존댓말": "항상 존댓말을 사용합니다.",
+    "반말": "반말로 대화합니다.",
+    "영어": "Respond in English.",
+}
+
+# 코드 스타일 선택 -> 규칙 목록
+_STYLE_BLOCKS: dict[str, str] = {
+    "간결함": """- 최소한의 코드로 작성
+- 불필요한 주석 제거
+- 자명한 코드 선호""",
+    "명확함": """- 명시적인 타입 선언
+- 복잡한 로직에 주석 추가
+- 함수/변수명은 설명적으로""",
+    "밸런스": """- 간결함과 명확함의 균형
+- 필요한 곳에만 주석
+- 일관된 네이밍 컨벤션""",
+}
+
+
+def _stat_key(path: str) -> Optional[tuple[int, int]]:
+    """파일/디렉토리 (수정 시각, 크기) (없으면 None)
+
+    mtime 해상도가 거친 파일 시스템에서도 내용 길이가 바뀌면 키가 달라짐
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=16)
+def _detect_project_type_cached(
+    cwd: str,
+    dir_key: Optional[tuple[int, int]],
+    package_json_key: Optional[tuple[int, int]]
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """(언어, 프레임워크) 감지 결과. 디렉토리/package.json이 바뀌면 캐시 키도 바뀜"""
+    # 디렉토리를 한 번만 읽어서 파일 이름 집합으로 확인
+    try:
+        with os.scandir(cwd) as it:
+            present = {entry.name for entry in it if entry.is_file()}
+    except OSError:
+        present = set()
+
+    # 순서를 유지하면서 중복 제거
+    languages: dict[str, None] = {}
+    frameworks: dict[str, None] = {}
+    for filename, lang, lang_frameworks in _DETECTIONS:
+        if filename in present:
+            languages[lang] = None
+            frameworks.update(dict.fromkeys(lang_frameworks))
+
+    # 프레임워크 세부 감지
+    if "package.json" in present:
+        try:
+            with open(os.path.join(cwd, "package.json"), "rb") as f:
+                pkg = json_loads(f.read())
+            deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
+            for dep, framework in _JS_FRAMEWORKS:
+                if dep in deps:
+                    frameworks[framework] = None
+        except (OSError, ValueError, AttributeError, TypeError):
+            pass
+
+    return tuple(languages), tuple(frameworks)
+
+
+# CLAUDE.md 기본 템플릿 (계층화된 구조)
+_CLAUDE_MD_TEMPLATE = """# CLAUDE.md
+
+> 생성: {today} | Claude Config v0.2.0
+
+---
+
+# 영구 규칙 (Permanent)
+
+> 변하지 않는 핵심 규칙. 삭제/수정 시 신중하게.
+
+## 프로젝트 개요
+
+### 기술 스택
+{tech_stack}
+
+## 코딩 규칙
 
-from claude_config.log_analyzer import LogAnalyzer
-from claude_config.pattern_extractor import PatternExtractor
+### 말투
+- {tone_rule}
+
+### 코드 스타일
+{style_rules}
+{extra_rules_section}
+### 커밋 메시지
+```
+feat: 새로운 기능
+fix: 버그 수정
+docs: 문서 변경
+style: 코드 포맷팅
+refactor: 리팩토링
+test: 테스트
+chore: 빌드/설정
+```
+
+---
+
+# 검증된 패턴 (Validated)
+
+> 2회 이상 유용했던 규칙. "최근 학습"에서 승격됨.
+
+<!-- 검증된 패턴이 여기에 추가됩니다 -->
+
+---
+
+# 최근 학습 (Recent)
+
+> 새로 발견한 패턴. 2회 이상 유용하면 "검증된 패턴"으로 승격.
+> `claude-config learn` 실행 시 자동 업데이트됨.
+{learned_patterns}
+<!-- 새로운 학습은 여기에 날짜와 함께 추가 -->
+
+---
+
+# 폐기 예정 (Deprecated)
+
+> 더 이상 적용 안 되거나 대체된 규칙. 다음 정리 시 삭제됨.
+
+<!-- 폐기 예정 규칙은 여기에 추가 -->
+
+---
+
+## CLAUDE.md 관리 규칙
+
+- 새 패턴 발견 시: "최근 학습" 섹션에 날짜와 함께 추가
+- 2회 이상 유용했으면: "검증된 패턴"으로 이동
+- 더 이상 유효하지 않으면: "폐기 예정"으로 이동
+- `claude-config learn` 실행: 패턴 자동 분석 및 제안
+
+---
+
+*Generated by [Claude Config](https://github.com/besslframework-stack/claude-config)*
+"""
 
 
 class ConfigGenerator:
     def __init__(self):
-        self.analyzer = LogAnalyzer()
-        self.extractor = PatternExtractor()
+        # 로그 분석기는 실제로 로그를 분석할 때 처음 import/생성
+        self._analyzer: Optional["LogAnalyzer"] = None
+        self._extractor: Optional["PatternExtractor"] = None
+
+    @property
+    def analyzer(self) -> "LogAnalyzer":
+        if self._analyzer is None:
+            from claude_config.log_analyzer import LogAnalyzer
+            self._analyzer = LogAnalyzer()
+        return self._analyzer
+
+    @property
+    def extractor(self) -> "PatternExtractor":
+        if self._extractor is None:
+            from claude_config.pattern_extractor import PatternExtractor
+            self._extractor = PatternExtractor()
+        return self._extractor
 
     def detect_project_type(self) -> dict:
         """프로젝트 파일 구조에서 타입과 스택 자동 감지"""
-        cwd = Path.cwd()
-        detected = {
+        cwd = os.getcwd()
+        languages, frameworks = _detect_project_type_cached(
+            cwd, _stat_key(cwd), _stat_key(os.path.join(cwd, "package.json"))
+        )
+        return {
             "type": "general",
-            "languages": [],
-            "frameworks": []
+            "languages": list(languages),
+            "frameworks": list(frameworks)
         }
 
-        # 언어/프레임워크 감지 규칙
-        detections = [
-            ("package.json", "JavaScript/TypeScript", ["Node.js"]),
-            ("tsconfig.json", "TypeScript", []),
-            ("pyproject.toml", "Python", []),
-            ("requirements.txt", "Python", []),
-            ("go.mod", "Go", []),
-            ("Cargo.toml", "Rust", []),
-            ("pom.xml", "Java", ["Maven"]),
-            ("build.gradle", "Java/Kotlin", ["Gradle"]),
-            ("Gemfile", "Ruby", []),
-            ("composer.json", "PHP", []),
-            ("pubspec.yaml", "Dart", ["Flutter"]),
-        ]
-
-        for filename, lang, frameworks in detections:
-            if (cwd / filename).exists():
-                if lang not in detected["languages"]:
-                    detected["languages"].append(lang)
-                detected["frameworks"].extend(frameworks)
-
-        # 프레임워크 세부 감지
-        if (cwd / "package.json").exists():
-            try:
-                import json
-                pkg = json.loads((cwd / "package.json").read_text())
-                deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-                if "react" in deps:
-                    detected["frameworks"].append("React")
-                if "next" in deps:
-                    detected["frameworks"].append("Next.js")
-                if "vue" in deps:
-                    detected["frameworks"].append("Vue")
-                if "express" in deps:
-                    detected["frameworks"].append("Express")
-            except:
-                pass
-
-        return detected
-
     def ask_questions(self) -> dict:
         """사용자에게 질문하여 선호도 수집"""
         print("\n=== Claude Config 초기 설정 ===\n")
@@ -127,58 +281,42 @@ class ConfigGenerator:
         """기존 대화 로그 분석"""
         print("\n기존 대화 로그 분석 중...")
 
-        conversations = self.analyzer.get_recent_conversations(limit=limit)
+        # 대화를 하나씩 읽으면서 패턴 추출과 도구 사용 통계를 한 번에 집계
+        patterns = self.extractor.analyze(
+            self.analyzer.iter_recent_conversations(limit=limit), tool_top_k=5
+        )
 
-        if not conversations:
+        if not patterns["conversation_count"]:
             print("  분석할 대화 로그가 없습니다.")
             return {}
 
-        print(f"  {len(conversations)}개 대화 분석 완료")
-
-        # 패턴 추출
-        patterns = self.extractor.analyze(conversations)
-
-        # 도구 사용 통계
-        tool_usage = self.analyzer.get_all_tool_usage(conversations)
+        print(f"  {patterns['conversation_count']}개 대화 분석 완료")
 
         # 주요 파일 유형
         edit_patterns = patterns.get("edit_patterns", {})
-        top_extensions = list(edit_patterns.get("by_extension", {}).items())[:3]
+        top_extensions = heapq.nlargest(
+            3, edit_patterns.get("by_extension", {}).items(), key=itemgetter(1)
+        )
 
         return {
             "corrections": patterns.get("corrections", []),
             "repeated_requests": patterns.get("repeated_requests", {}),
-            "top_tools": list(tool_usage.items())[:5],
+            "top_tools": list(patterns["tool_usage"].items()),
             "top_extensions": top_extensions
         }
 
     def generate_claude_md(self, answers: dict, analysis: dict) -> str:
         """CLAUDE.md 내용 생성 - 계층화된 구조 사용"""
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = time.strftime("%Y-%m-%d")
 
         # 기술 스택 문자열 생성
-        tech_stack = "\n".join(f"- {lang}" for lang in answers['languages'])
-        if answers.get('frameworks'):
-            tech_stack += "\n" + "\n".join(f"- {fw}" for fw in answers['frameworks'])
-
-        # 말투 규칙
-        tone_rule = "항상 존댓말을 사용합니다." if answers['tone'] == "존댓말" else \
-                    "반말로 대화합니다." if answers['tone'] == "반말" else \
-                    "Respond in English."
-
-        # 코드 스타일 규칙
-        if answers['code_style'] == "간결함":
-            style_rules = """- 최소한의 코드로 작성
-- 불필요한 주석 제거
-- 자명한 코드 선호"""
-        elif answers['code_style'] == "명확함":
-            style_rules = """- 명시적인 타입 선언
-- 복잡한 로직에 주석 추가
-- 함수/변수명은 설명적으로"""
-        else:
-            style_rules = """- 간결함과 명확함의 균형
-- 필요한 곳에만 주석
-- 일관된 네이밍 컨벤션"""
+        tech_stack = "\n".join(
+            f"- {item}" for item in [*answers['languages'], *(answers.get('frameworks') or [])]
+        )
+
+        # 말투/코드 스타일 규칙 (알 수 없는 값은 영어/밸런스)
+        tone_rule = _TONE_LINES.get(answers['tone'], _TONE_LINES["영어"])
+        style_rules = _STYLE_BLOCKS.get(answers['code_style'], _STYLE_BLOCKS["밸런스"])
 
         # 추가 규칙
         extra_rules_section = ""
@@ -193,96 +331,31 @@ class ConfigGenerator:
             extensions = analysis.get("top_extensions", [])
 
             if corrections or requests or extensions:
-                learned_patterns = f"\n### [{today}] 로그 분석 결과\n"
+                learned_lines = [f"\n### [{today}] 로그 분석 결과"]
 
                 if corrections:
-                    tone_corrections = [c for c in corrections if "반말" in c.get("keyword", "") or "존댓말" in c.get("keyword", "")]
-                    if tone_corrections:
-                        learned_patterns += "- 말투 관련 교정 감지됨\n"
+                    if count_tone_corrections(corrections):
+                        learned_lines.append("- 말투 관련 교정 감지됨")
 
                 if requests:
-                    for req, count in list(requests.items())[:2]:
-                        learned_patterns += f"- {req}: {count}회 반복\n"
+                    for req, count in heapq.nlargest(2, requests.items(), key=itemgetter(1)):
+                        learned_lines.append(f"- {req}: {count}회 반복")
 
                 if extensions:
                     top_ext = extensions[0] if extensions else None
                     if top_ext:
-                        learned_patterns += f"- 주요 파일: .{top_ext[0]} ({top_ext[1]}회)\n"
-
-        md = f"""# CLAUDE.md
-
-> 생성: {today} | Claude Config v0.2.0
-
----
+                        learned_lines.append(f"- 주요 파일: .{top_ext[0]} ({top_ext[1]}회)")
 
-# 영구 규칙 (Permanent)
-
-> 변하지 않는 핵심 규칙. 삭제/수정 시 신중하게.
-
-## 프로젝트 개요
+                learned_patterns = "\n".join(learned_lines) + "\n"
 
-### 기술 스택
-{tech_stack}
-
-## 코딩 규칙
-
-### 말투
-- {tone_rule}
-
-### 코드 스타일
-{style_rules}
-{extra_rules_section}
-### 커밋 메시지
-```
-feat: 새로운 기능
-fix: 버그 수정
-docs: 문서 변경
-style: 코드 포맷팅
-refactor: 리팩토링
-test: 테스트
-chore: 빌드/설정
-```
-
----
-
-# 검증된 패턴 (Validated)
-
-> 2회 이상 유용했던 규칙. "최근 학습"에서 승격됨.
-
-<!-- 검증된 패턴이 여기에 추가됩니다 -->
-
----
-
-# 최근 학습 (Recent)
-
-> 새로 발견한 패턴. 2회 이상 유용하면 "검증된 패턴"으로 승격.
-> `claude-config learn` 실행 시 자동 업데이트됨.
-{learned_patterns}
-<!-- 새로운 학습은 여기에 날짜와 함께 추가 -->
-
----
-
-# 폐기 예정 (Deprecated)
-
-> 더 이상 적용 안 되거나 대체된 규칙. 다음 정리 시 삭제됨.
-
-<!-- 폐기 예정 규칙은 여기에 추가 -->
-
----
-
-## CLAUDE.md 관리 규칙
-
-- 새 패턴 발견 시: "최근 학습" 섹션에 날짜와 함께 추가
-- 2회 이상 유용했으면: "검증된 패턴"으로 이동
-- 더 이상 유효하지 않으면: "폐기 예정"으로 이동
-- `claude-config learn` 실행: 패턴 자동 분석 및 제안
-
----
-
-*Generated by [Claude Config](https://github.com/besslframework-stack/claude-config)*
-"""
-
-        return md
+        return _CLAUDE_MD_TEMPLATE.format(
+            today=today,
+            tech_stack=tech_stack,
+            tone_rule=tone_rule,
+            style_rules=style_rules,
+            extra_rules_section=extra_rules_section,
+            learned_patterns=learned_patterns,
+        )
 
     def init(self, output_path: Optional[str] = None, skip_questions: bool = False) -> str:
         """초기 설정 실행"""
@@ -311,13 +384,18 @@ chore: 빌드/설정
         else:
             output = Path.cwd() / "CLAUDE.md"
 
+        # 내용이 같으면 백업/저장 생략
+        if is_unchanged(output, content.encode("utf-8")):
+            print(f"\nCLAUDE.md 변경 사항 없음: {output}")
+            return str(output)
+
         # 기존 파일 백업
         if output.exists():
             backup = output.with_suffix(".md.backup")
             output.rename(backup)
             print(f"\n기존 파일 백업: {backup}")
 
-        output.write_text(content, encoding="utf-8")
+        atomic_write_text(output, content)
         print(f"\nCLAUDE.md 생성 완료: {output}")
 
         return str(output)
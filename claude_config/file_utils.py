@@ -0,0 +1,71 @@
+"""
+파일 입출력 유틸리티
+설정 파일을 원자적으로 저장 (내용이 같으면 쓰지 않음), JSON 인코딩/디코딩
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: pip install "claude-config[fast]"
+    orjson = None
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """JSON 디코딩 (orjson이 있으면 사용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj: Any) -> bytes:
+    """들여쓰기 2칸, 비ASCII 그대로 UTF-8 바이트로 인코딩"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def is_unchanged(path: Path, data: bytes) -> bool:
+    """파일 내용이 data와 같은지 확인"""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> bool:
+    """임시 파일에 쓴 뒤 os.replace로 교체. 내용이 같으면 False 반환"""
+    # 심볼릭 링크는 링크 자체가 아니라 대상 파일을 교체
+    path = Path(os.path.realpath(path))
+    if is_unchanged(path, data):
+        return False
+
+    # 같은 디렉토리에 임시 파일을 만들어야 os.replace가 원자적으로 동작
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        try:
+            # 기존 파일 권한 유지
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return True
+
+
+def atomic_write_text(path: Path, content: str, encoding: str = "utf-8") -> bool:
+    """텍스트 버전의 atomic_write_bytes"""
+    return atomic_write_bytes(path, content.encode(encoding))
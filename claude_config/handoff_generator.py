@@ -3,16 +3,25 @@ Handoff 생성기
 세션 인수인계용 HANDOFF.md 자동 생성
 """
 
-import json
+import re
+import time
+from collections import deque
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from dataclasses import dataclass
 
-from claude_config.log_analyzer import LogAnalyzer
+from claude_config.log_analyzer import content_text
 
+if TYPE_CHECKING:
+    from claude_config.log_analyzer import LogAnalyzer
 
-@dataclass
+
+# 완료 보고 / 작업 요청 키워드 (소문자 변환 없이 한 번에 검색)
+_DONE_RE = re.compile(r"완료|done", re.IGNORECASE)
+_USER_TODO_RE = re.compile(r"해줘|해주세요|하자|해야|필요|todo", re.IGNORECASE)
+
+
+@dataclass(slots=True)
 class HandoffContext:
     summary: str
     completed_tasks: list[str]
@@ -24,7 +33,16 @@ class HandoffContext:
 
 class HandoffGenerator:
     def __init__(self, claude_dir: Optional[str] = None):
-        self.analyzer = LogAnalyzer(claude_dir)
+        # 로그 분석기는 세션을 읽을 때 처음 import/생성 (quick 모드는 불필요)
+        self._claude_dir = claude_dir
+        self._analyzer: Optional["LogAnalyzer"] = None
+
+    @property
+    def analyzer(self) -> "LogAnalyzer":
+        if self._analyzer is None:
+            from claude_config.log_analyzer import LogAnalyzer
+            self._analyzer = LogAnalyzer(self._claude_dir)
+        return self._analyzer
 
     def get_latest_session(self) -> Optional[Path]:
         """가장 최근 세션 파일 반환"""
@@ -35,30 +53,29 @@ class HandoffGenerator:
         return None
 
     def extract_context_from_session(self, session_path: Path) -> HandoffContext:
-        """세션에서 컨텍스트 추출"""
-        conv = self.analyzer.extract_conversation(session_path)
-
-        completed_tasks = []
-        pending_tasks = []
+        """세션에서 컨텍스트 추출 (세션 파일을 한 번만 순회)"""
+        summary = None
+        # 중복 제거 및 최근 것 우선: 처음 나온 순서대로 최근 5개만 유지
+        completed_tasks = deque(maxlen=5)
+        pending_tasks = deque(maxlen=5)
+        completed_seen = set()
+        pending_seen = set()
         key_decisions = []
         important_files = set()
-        summary_parts = []
 
-        for msg in conv.messages:
-            content = msg.content
-            if isinstance(content, list):
-                content = " ".join(str(item) for item in content)
-            elif not isinstance(content, str):
-                content = str(content) if content else ""
+        for msg in self.analyzer.iter_messages(session_path):
+            content = content_text(msg.content)
 
             # 완료된 작업 감지
             if msg.role == "assistant":
-                if "완료" in content or "done" in content.lower():
-                    # 간단한 요약 추출
-                    lines = content.split('\n')
-                    for line in lines[:3]:
+                if _DONE_RE.search(content):
+                    # 간단한 요약 추출 (앞 3줄만 분리)
+                    for line in content.split('\n', 3)[:3]:
                         if line.strip() and len(line) < 100:
-                            completed_tasks.append(line.strip()[:80])
+                            task = line.strip()[:80]
+                            if task not in completed_seen:
+                                completed_seen.add(task)
+                                completed_tasks.append(task)
                             break
 
                 # 도구 사용에서 파일 추출
@@ -75,30 +92,23 @@ class HandoffGenerator:
 
             # 사용자 요청에서 TODO 추출
             if msg.role == "user":
-                content_lower = content.lower()
-                if any(kw in content_lower for kw in ["해줘", "해주세요", "하자", "해야", "필요", "todo"]):
+                # 첫 번째 사용자 메시지를 요약으로
+                if summary is None and content:
+                    summary = content[:200]
+
+                if _USER_TODO_RE.search(content):
                     if len(content) < 150:
                         # 이미 완료된 것과 겹치지 않으면 pending으로
-                        pending_tasks.append(content.strip()[:100])
+                        task = content.strip()[:100]
+                        if task not in pending_seen:
+                            pending_seen.add(task)
+                            pending_tasks.append(task)
 
-        # 중복 제거 및 최근 것 우선
-        completed_tasks = list(dict.fromkeys(completed_tasks))[-5:]
-        pending_tasks = list(dict.fromkeys(pending_tasks))[-5:]
-
-        # 첫 번째 사용자 메시지를 요약으로
-        for msg in conv.messages:
-            if msg.role == "user":
-                content = msg.content
-                if isinstance(content, list):
-                    content = " ".join(str(item) for item in content)
-                elif not isinstance(content, str):
-                    content = str(content) if content else ""
-                if content:
-                    summary_parts.append(content[:200])
-                    break
+        completed_tasks = list(completed_tasks)
+        pending_tasks = list(pending_tasks)
 
         return HandoffContext(
-            summary=summary_parts[0] if summary_parts else "세션 요약 없음",
+            summary=summary or "세션 요약 없음",
             completed_tasks=completed_tasks,
             pending_tasks=pending_tasks,
             key_decisions=key_decisions,
@@ -113,8 +123,7 @@ class HandoffGenerator:
         custom_notes: Optional[str] = None
     ) -> str:
         """HANDOFF.md 내용 생성"""
-        now = datetime.now()
-        timestamp = now.strftime("%Y-%m-%d %H:%M")
+        timestamp = time.strftime("%Y-%m-%d %H:%M")
 
         # 완료된 작업 섹션
         completed_section = ""
@@ -218,12 +227,7 @@ class HandoffGenerator:
         # 세션 찾기
         if session_id and session_id != "latest":
             # 특정 세션 ID로 찾기
-            session_path = None
-            for project_dir in self.analyzer.get_all_project_dirs():
-                potential_path = project_dir / f"{session_id}.jsonl"
-                if potential_path.exists():
-                    session_path = potential_path
-                    break
+            session_path = self.analyzer.find_session(session_id)
         else:
             session_path = self.get_latest_session()
 
@@ -252,8 +256,7 @@ class HandoffGenerator:
 
     def create_quick_handoff(self, notes: str) -> str:
         """빠른 수동 핸드오프 생성 (로그 분석 없이)"""
-        now = datetime.now()
-        timestamp = now.strftime("%Y-%m-%d %H:%M")
+        timestamp = time.strftime("%Y-%m-%d %H:%M")
 
         md = f"""# HANDOFF.md
 
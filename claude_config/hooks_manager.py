@@ -3,13 +3,16 @@ Hooks 관리자
 .claude/settings.json의 hooks 섹션을 관리
 """
 
-import json
+import functools
+import os
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
 
+from claude_config.file_utils import atomic_write_bytes, json_dumps_pretty, json_loads
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Hook:
     matcher: str
     command: str
@@ -17,6 +20,7 @@ class Hook:
 
 
 # 자주 사용하는 훅 템플릿
+# Bash 매처 훅은 모든 Bash 호출마다 실행되므로 grep 대신 셸 내장 case로 검사
 HOOK_TEMPLATES = {
     "lint-python": Hook(
         matcher="Edit",
@@ -40,12 +44,12 @@ HOOK_TEMPLATES = {
     ),
     "no-env-commit": Hook(
         matcher="Bash",
-        command="! grep -q '\\.env' <<< \"$COMMAND\" || echo 'Warning: .env file operation detected'",
+        command="case \"$COMMAND\" in *.env*) echo 'Warning: .env file operation detected';; esac",
         description=".env 파일 조작 경고"
     ),
     "no-force-push": Hook(
         matcher="Bash",
-        command="! grep -q 'push.*--force\\|push.*-f' <<< \"$COMMAND\" || exit 1",
+        command="case \"$COMMAND\" in *push*-f*) exit 1;; esac",
         description="force push 방지"
     ),
     "build-check": Hook(
@@ -61,6 +65,41 @@ HOOK_TEMPLATES = {
 }
 
 
+@functools.lru_cache(maxsize=16)
+def _suggest_hooks_cached(project_dir: str, mtime: Optional[int]) -> tuple[str, ...]:
+    """Hook suggestions for a directory; mtime changes when entries are added/removed"""
+    suggestions = []
+
+    # List the project directory once instead of stat()-ing each marker
+    try:
+        with os.scandir(project_dir) as it:
+            entries = {entry.name for entry in it}
+    except OSError:
+        entries = set()
+
+    # Python project
+    if "pyproject.toml" in entries or "requirements.txt" in entries:
+        suggestions.extend(["lint-python", "test-python"])
+
+    # JavaScript/TypeScript project
+    if "package.json" in entries:
+        suggestions.extend(["lint-js", "test-js"])
+
+        # Check for TypeScript
+        if "tsconfig.json" in entries:
+            suggestions.append("type-check")
+
+    # Git project
+    if ".git" in entries:
+        suggestions.append("no-force-push")
+
+    # .env file exists
+    if ".env" in entries or ".env.local" in entries:
+        suggestions.append("no-env-commit")
+
+    return tuple(suggestions)
+
+
 class HooksManager:
     def __init__(self, project_dir: Optional[str] = None):
         if project_dir:
@@ -78,16 +117,14 @@ class HooksManager:
     def read_settings(self) -> dict:
         """Read .claude/settings.json"""
         if self.settings_path.exists():
-            return json.loads(self.settings_path.read_text(encoding='utf-8'))
+            return json_loads(self.settings_path.read_bytes())
         return {}
 
     def write_settings(self, settings: dict) -> None:
         """Write .claude/settings.json"""
         self.ensure_claude_dir()
-        self.settings_path.write_text(
-            json.dumps(settings, indent=2, ensure_ascii=False),
-            encoding='utf-8'
-        )
+        # Temp file + os.replace: a crash never leaves a half-written settings.json
+        atomic_write_bytes(self.settings_path, json_dumps_pretty(settings))
 
     def get_hooks(self) -> dict:
         """Get current hooks from settings"""
@@ -207,31 +244,12 @@ class HooksManager:
 
     def suggest_hooks(self) -> list[str]:
         """Suggest hooks based on project structure"""
-        suggestions = []
-
-        # Python project
-        if (self.project_dir / "pyproject.toml").exists() or \
-           (self.project_dir / "requirements.txt").exists():
-            suggestions.extend(["lint-python", "test-python"])
-
-        # JavaScript/TypeScript project
-        if (self.project_dir / "package.json").exists():
-            suggestions.extend(["lint-js", "test-js"])
-
-            # Check for TypeScript
-            if (self.project_dir / "tsconfig.json").exists():
-                suggestions.append("type-check")
-
-        # Git project
-        if (self.project_dir / ".git").exists():
-            suggestions.append("no-force-push")
-
-        # .env file exists
-        if (self.project_dir / ".env").exists() or \
-           (self.project_dir / ".env.local").exists():
-            suggestions.append("no-env-commit")
-
-        return suggestions
+        project_dir = str(self.project_dir)
+        try:
+            mtime = os.stat(project_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        return list(_suggest_hooks_cached(project_dir, mtime))
 
 
 if __name__ == "__main__":
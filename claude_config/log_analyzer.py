@@ -3,15 +3,89 @@
 ~/.claude/projects/ 폴더의 jsonl 파일을 파싱하여 대화 내용 추출
 """
 
-import json
+import itertools
+import mmap
 import os
+import re
+import sys
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
+from operator import itemgetter
 from typing import Generator, Optional
 from dataclasses import dataclass, field
 
+from claude_config.file_utils import json_loads
 
-@dataclass
+
+# 코드 작성 요청으로 보는 키워드 (대소문자 무시, 메시지당 한 번 검색)
+# 키워드가 적고 메시지도 짧아서 표준 re 하나로 충분함 (hyperscan/re2 같은 외부 엔진 불필요)
+_CODE_KEYWORDS = ("코드", "구현", "함수", "클래스", "작성", "만들어", "생성", "code", "implement", "create", "write")
+_CODE_REQUEST_RE = re.compile("|".join(map(re.escape, _CODE_KEYWORDS)), re.IGNORECASE)
+
+# 메시지 유무를 확인할 때 한 번에 읽는 크기
+_SCAN_CHUNK_SIZE = 64 * 1024
+
+# 이 크기 이상인 세션 파일은 mmap으로 읽음 (필요한 페이지만 OS가 올림)
+# 몇 MB 정도는 버퍼 읽기가 더 빨라서 임계값을 낮추지 않음
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# 그보다 작은 세션 파일을 줄 단위로 읽을 때 쓰는 버퍼 크기 (기본 8KB보다 read 호출이 적음)
+_READ_BUFFER_SIZE = 1024 * 1024
+
+
+def content_text(content) -> str:
+    """메시지 content를 문자열로 정규화
+
+    list인 경우 텍스트 블록만 공백으로 이어 붙임 (tool_use/tool_result 블록의 repr은 만들지 않음)
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            item if isinstance(item, str) else item.get("text", "")
+            for item in content
+            if isinstance(item, str) or (isinstance(item, dict) and item.get("type") == "text")
+        )
+    return str(content) if content else ""
+
+
+def _tool_name(item: dict):
+    """tool_use 블록의 도구 이름 (몇 가지 이름이 반복되므로 intern해서 같은 객체를 공유)"""
+    name = item.get("name")
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+def _may_have_messages(file_path: Path) -> bool:
+    """user/assistant 항목이 있을 수 있는지 바이트 검색으로만 확인
+
+    메시지가 있으면 보통 첫 블록에서 바로 True. False는 파일 전체에
+    "user"/"assistant" 문자열이 없을 때만 반환 (요약만 있는 세션 등)
+    """
+    with open(file_path, 'rb') as f:
+        tail = b""
+        while True:
+            chunk = f.read(_SCAN_CHUNK_SIZE)
+            if not chunk:
+                return False
+            buf = tail + chunk
+            if b'"user"' in buf or b'"assistant"' in buf:
+                return True
+            # 블록 경계에 걸친 문자열도 찾도록 끝부분을 남김
+            tail = buf[-len(b'"assistant"'):]
+
+
+def _mmap_lines(f) -> Generator[bytes, None, None]:
+    """mmap 위에서 줄 단위로 잘라서 반환 (파일 버퍼 복사 없이, 줄 끝 개행 포함)
+
+    줄 경계는 C로 구현된 mm.readline으로 찾음 (find/슬라이스를 Python에서 반복하면 몇 배 느림)
+    """
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield from iter(mm.readline, b"")
+
+
+# namedtuple이 아닌 이유: tool_results는 생성 후에 추가되고, 기본 리스트는 인스턴스마다 새로 만들어야 함
+@dataclass(slots=True)
 class Message:
     role: str  # "user" or "assistant"
     content: str
@@ -20,7 +94,7 @@ class Message:
     tool_results: list = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     session_id: str
     project_path: str
@@ -28,6 +102,23 @@ class Conversation:
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
 
+    @property
+    def tool_names(self) -> list[str]:
+        """assistant 메시지의 도구 이름을 순서대로 펼친 목록 (messages에서 매번 계산)"""
+        return [tool.get("name", "unknown") for tool in self.iter_tool_calls()]
+
+    def iter_user_messages(self) -> Generator[Message, None, None]:
+        """사용자 메시지만 순서대로 반환 (목록을 새로 만들지 않음)"""
+        return (msg for msg in self.messages if msg.role == "user")
+
+    def iter_tool_calls(self) -> Generator[dict, None, None]:
+        """assistant 메시지의 도구 호출을 순서대로 펼쳐서 반환"""
+        return (
+            tool
+            for msg in self.messages if msg.role == "assistant"
+            for tool in msg.tool_calls
+        )
+
 
 class LogAnalyzer:
     def __init__(self, claude_dir: Optional[str] = None):
@@ -39,30 +130,65 @@ class LogAnalyzer:
 
     def get_all_project_dirs(self) -> list[Path]:
         """모든 프로젝트 디렉토리 반환"""
-        if not self.projects_dir.exists():
+        try:
+            with os.scandir(self.projects_dir) as it:
+                return [Path(entry.path) for entry in it if entry.is_dir()]
+        except (FileNotFoundError, NotADirectoryError):
             return []
-        return [d for d in self.projects_dir.iterdir() if d.is_dir()]
+
+    def _session_entries(self, project_dir: Path) -> list[tuple[float, Path]]:
+        """프로젝트 내 세션 파일의 (수정 시각, 경로) 목록 (디렉토리를 한 번만 읽음)"""
+        sessions = []
+        with os.scandir(project_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".jsonl"):
+                    continue
+                try:
+                    if entry.is_file():
+                        sessions.append((entry.stat().st_mtime, Path(entry.path)))
+                except OSError:
+                    continue  # 목록을 읽은 뒤 삭제된 파일
+        return sessions
 
     def get_session_files(self, project_dir: Path) -> list[Path]:
-        """프로젝트 내 모든 세션 파일(.jsonl) 반환"""
-        return sorted(project_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+        """프로젝트 내 모든 세션 파일(.jsonl) 반환 (최신순)"""
+        sessions = self._session_entries(project_dir)
+        sessions.sort(key=itemgetter(0), reverse=True)
+        return [session_file for _, session_file in sessions]
+
+    def find_session(self, session_id: str) -> Optional[Path]:
+        """세션 ID로 세션 파일 찾기 (프로젝트마다 파일 이름으로 바로 확인)"""
+        for project_dir in self.get_all_project_dirs():
+            session_path = project_dir / f"{session_id}.jsonl"
+            if session_path.is_file():
+                return session_path
+        return None
 
     def parse_jsonl(self, file_path: Path) -> Generator[dict, None, None]:
-        """JSONL 파일 파싱"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
+        """JSONL 파일 파싱
+
+        바이트 그대로 디코더에 넘김 (orjson이 있으면 사용, 줄 단위 str 디코딩 생략).
+        파일 전체를 읽지 않고 1MB 버퍼로 한 줄씩 처리하며, 큰 파일은 mmap으로 읽음.
+        깨진 줄(잘못된 JSON/UTF-8)은 건너뜀
+        """
+        with open(file_path, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+            size = os.fstat(f.fileno()).st_size
+            # 빈 파일은 mmap할 수 없음
+            lines = _mmap_lines(f) if size and size >= _MMAP_THRESHOLD else f
+            for line in lines:
                 line = line.strip()
                 if line:
                     try:
-                        yield json.loads(line)
-                    except json.JSONDecodeError:
+                        yield json_loads(line)
+                    except ValueError:
                         continue
 
-    def extract_conversation(self, file_path: Path) -> Conversation:
-        """세션 파일에서 대화 추출"""
-        messages = []
-        session_id = file_path.stem
-        project_path = str(file_path.parent)
+    def iter_messages(self, file_path: Path) -> Generator[Message, None, None]:
+        """세션 파일의 메시지를 하나씩 반환 (전체 대화를 메모리에 올리지 않음)
+
+        tool_result는 직전 assistant 메시지의 tool_results에 나중에 추가됨
+        """
+        last_message = None
 
         for entry in self.parse_jsonl(file_path):
             msg_type = entry.get("type")
@@ -73,71 +199,101 @@ class LogAnalyzer:
                     text = content.get("content", "")
                 else:
                     text = str(content)
-                messages.append(Message(role="user", content=text))
+                last_message = Message(role="user", content=text)
+                yield last_message
 
             elif msg_type == "assistant":
                 content = entry.get("message", {})
-                text = ""
+                text_parts = []
                 tool_calls = []
 
                 if isinstance(content, dict):
                     content_list = content.get("content", [])
                     for item in content_list:
-                        if isinstance(item, dict):
-                            if item.get("type") == "text":
-                                text += item.get("text", "")
-                            elif item.get("type") == "tool_use":
-                                tool_calls.append({
-                                    "name": item.get("name"),
-                                    "input": item.get("input", {})
-                                })
-
-                messages.append(Message(
+                        if not isinstance(item, dict):
+                            continue
+                        # type은 한 번만 조회 (text가 아니면 두 번 찾던 부분)
+                        item_type = item.get("type")
+                        if item_type == "text":
+                            text_parts.append(item.get("text", ""))
+                        elif item_type == "tool_use":
+                            tool_calls.append({
+                                "name": _tool_name(item),
+                                "input": item.get("input", {})
+                            })
+
+                last_message = Message(
                     role="assistant",
-                    content=text,
+                    content="".join(text_parts),
                     tool_calls=tool_calls
-                ))
+                )
+                yield last_message
 
             elif msg_type == "tool_result":
-                if messages and messages[-1].role == "assistant":
-                    messages[-1].tool_results.append(entry.get("content", ""))
+                if last_message and last_message.role == "assistant":
+                    last_message.tool_results.append(entry.get("content", ""))
 
+    def extract_conversation(self, file_path: Path) -> Conversation:
+        """세션 파일에서 대화 추출"""
         return Conversation(
-            session_id=session_id,
-            project_path=project_path,
-            messages=messages
+            session_id=file_path.stem,
+            project_path=str(file_path.parent),
+            messages=self._parse_messages(file_path)
         )
 
-    def get_recent_conversations(self, limit: int = 10, project_filter: Optional[str] = None) -> list[Conversation]:
-        """최근 대화 목록 반환"""
-        conversations = []
-
+    def _parse_messages(self, file_path: Path) -> list[Message]:
+        """세션 파일 파싱. 메시지가 있을 수 없는 파일은 JSON 디코딩 없이 빈 목록"""
+        if not _may_have_messages(file_path):
+            return []
+        return list(self.iter_messages(file_path))
+
+    def iter_recent_conversations(
+        self,
+        limit: int = 10,
+        project_filter: Optional[str] = None
+    ) -> Generator[Conversation, None, None]:
+        """최근 대화를 하나씩 반환 (필요한 만큼만 파싱)
+
+        모든 프로젝트의 세션 파일을 수정 시각 기준 최신순으로 처리
+        """
+        count = 0
+        for session_file in self._recent_session_files(project_filter):
+            if count >= limit:
+                return
+
+            conv = self.extract_conversation(session_file)
+            if conv.messages:
+                count += 1
+                yield conv
+
+    def _recent_session_files(self, project_filter: Optional[str] = None) -> list[Path]:
+        """모든 프로젝트의 세션 파일을 최신순으로 반환 (stat만 하고 내용은 읽지 않음)"""
+        sessions = []
         for project_dir in self.get_all_project_dirs():
             if project_filter and project_filter not in str(project_dir):
                 continue
+            try:
+                sessions.extend(self._session_entries(project_dir))
+            except OSError:
+                continue
 
-            for session_file in self.get_session_files(project_dir):
-                conv = self.extract_conversation(session_file)
-                if conv.messages:
-                    conversations.append(conv)
-
-                if len(conversations) >= limit:
-                    return conversations
-
-        return conversations
+        sessions.sort(key=itemgetter(0), reverse=True)
+        return [session_file for _, session_file in sessions]
 
-    def get_all_tool_usage(self, conversations: list[Conversation]) -> dict[str, int]:
-        """모든 대화에서 도구 사용 빈도 집계"""
-        tool_counts = {}
+    def get_recent_conversations(self, limit: int = 10, project_filter: Optional[str] = None) -> list[Conversation]:
+        """최근 대화 목록 반환"""
+        return list(self.iter_recent_conversations(limit, project_filter))
 
-        for conv in conversations:
-            for msg in conv.messages:
-                if msg.role == "assistant":
-                    for tool in msg.tool_calls:
-                        name = tool.get("name", "unknown")
-                        tool_counts[name] = tool_counts.get(name, 0) + 1
+    def get_all_tool_usage(
+        self,
+        conversations: list[Conversation],
+        top_k: Optional[int] = None
+    ) -> dict[str, int]:
+        """모든 대화에서 도구 사용 빈도 집계 (top_k 지정 시 상위 k개만)"""
+        tool_counts = Counter(itertools.chain.from_iterable(conv.tool_names for conv in conversations))
 
-        return dict(sorted(tool_counts.items(), key=lambda x: x[1], reverse=True))
+        # most_common(k)는 내부적으로 heapq.nlargest, None이면 전체 정렬 (동률은 처음 나온 순서)
+        return dict(tool_counts.most_common(top_k))
 
     def get_user_patterns(self, conversations: list[Conversation]) -> dict:
         """사용자 메시지 패턴 분석"""
@@ -148,36 +304,20 @@ class LogAnalyzer:
             "code_request_ratio": 0
         }
 
-        total_messages = 0
-        total_length = 0
-        question_count = 0
-        code_request_count = 0
-
-        code_keywords = ["코드", "구현", "함수", "클래스", "작성", "만들어", "생성", "code", "implement", "create", "write"]
-
-        for conv in conversations:
-            for msg in conv.messages:
-                if msg.role == "user":
-                    content = msg.content
-                    # content가 list인 경우 문자열로 변환
-                    if isinstance(content, list):
-                        content = " ".join(str(item) for item in content)
-                    elif not isinstance(content, str):
-                        content = str(content)
-
-                    total_messages += 1
-                    total_length += len(content)
-
-                    if "?" in content or content.strip().endswith("?"):
-                        question_count += 1
-
-                    if any(kw in content.lower() for kw in code_keywords):
-                        code_request_count += 1
-
-        if total_messages > 0:
-            patterns["avg_message_length"] = total_length / total_messages
-            patterns["question_ratio"] = question_count / total_messages
-            patterns["code_request_ratio"] = code_request_count / total_messages
+        # 사용자 메시지를 한 번 모은 뒤 통계마다 C 수준 반복(map/sum)으로 집계
+        contents = [
+            content_text(msg.content)
+            for conv in conversations
+            for msg in conv.iter_user_messages()
+        ]
+
+        if contents:
+            total_messages = len(contents)
+            patterns["avg_message_length"] = sum(map(len, contents)) / total_messages
+            patterns["question_ratio"] = sum("?" in content for content in contents) / total_messages
+            patterns["code_request_ratio"] = sum(
+                1 for content in contents if _CODE_REQUEST_RE.search(content)
+            ) / total_messages
 
         return patterns
 
@@ -188,9 +328,9 @@ if __name__ == "__main__":
 
     print(f"분석된 대화 수: {len(conversations)}")
 
-    tool_usage = analyzer.get_all_tool_usage(conversations)
+    tool_usage = analyzer.get_all_tool_usage(conversations, top_k=10)
     print("\n도구 사용 빈도:")
-    for tool, count in list(tool_usage.items())[:10]:
+    for tool, count in tool_usage.items():
         print(f"  {tool}: {count}")
 
     patterns = analyzer.get_user_patterns(conversations)
@@ -5,23 +5,31 @@ https://github.com/besslframework-stack/claude-config
 """
 
 import argparse
-import json
 import sys
 from pathlib import Path
-from datetime import datetime
 
-from claude_config.log_analyzer import LogAnalyzer
-from claude_config.pattern_extractor import PatternExtractor
-from claude_config.claude_md_updater import ClaudeMdUpdater
-from claude_config.config_generator import ConfigGenerator
-from claude_config.hooks_manager import HooksManager, HOOK_TEMPLATES
-from claude_config.handoff_generator import HandoffGenerator
+# 각 명령 모듈은 해당 명령 함수 안에서 import (--version, hooks 등이 로그 분석 모듈을 읽지 않도록)
 
 VERSION = "0.2.0"
 
 
+def find_claude_md(cwd: Path) -> Path:
+    """현재 디렉토리부터 상위로 올라가며 CLAUDE.md 찾기 (없으면 cwd/CLAUDE.md)
+
+    실행마다 한 번만 호출되고 디렉토리 깊이만큼 stat하므로 캐시하지 않음.
+    경로를 저장해 두면 더 가까운 위치에 CLAUDE.md가 새로 생겼을 때 틀린 파일을 가리킴
+    """
+    for directory in (cwd, *cwd.parents):
+        candidate = directory / "CLAUDE.md"
+        if candidate.exists():
+            return candidate
+    return cwd / "CLAUDE.md"
+
+
 def init_command(args):
     """CLAUDE.md 초기 설정"""
+    from claude_config.config_generator import ConfigGenerator
+
     generator = ConfigGenerator()
     generator.init(
         output_path=args.output,
@@ -31,6 +39,10 @@ def init_command(args):
 
 def learn_command(args):
     """대화 로그 학습 및 업데이트 제안"""
+    from claude_config.log_analyzer import LogAnalyzer
+    from claude_config.pattern_extractor import PatternExtractor
+    from claude_config.claude_md_updater import ClaudeMdUpdater
+
     print("대화 로그 분석 중...\n")
 
     # 분석
@@ -64,6 +76,12 @@ def learn_command(args):
 
 def analyze_command(args):
     """대화 로그 상세 분석"""
+    from datetime import datetime
+
+    from claude_config.file_utils import json_dumps_pretty
+    from claude_config.log_analyzer import LogAnalyzer
+    from claude_config.pattern_extractor import PatternExtractor
+
     print("대화 로그 분석 중...\n")
 
     analyzer = LogAnalyzer()
@@ -88,7 +106,8 @@ def analyze_command(args):
     print(f"  코드 요청 비율: {patterns['code_request_ratio']:.1%}")
 
     # 패턴 추출
-    extractor = PatternExtractor()
+    # 결과 파일에는 교정 직전의 AI 응답도 함께 저장
+    extractor = PatternExtractor(store_responses=bool(args.output))
     extracted = extractor.analyze(conversations)
 
     print(f"\n=== 추출된 패턴 ===")
@@ -109,7 +128,7 @@ def analyze_command(args):
                 "edit_patterns": extracted["edit_patterns"],
             }
         }
-        output_path.write_text(json.dumps(output_data, ensure_ascii=False, indent=2))
+        output_path.write_bytes(json_dumps_pretty(output_data))
         print(f"\n분석 결과 저장: {output_path}")
 
 
@@ -121,6 +140,8 @@ def doc_command(args):
 
 def hooks_command(args):
     """Hooks 관리"""
+    from claude_config.hooks_manager import HooksManager, HOOK_TEMPLATES
+
     manager = HooksManager()
 
     if args.hooks_action == "init":
@@ -239,6 +260,8 @@ def hooks_command(args):
 
 def handoff_command(args):
     """세션 인수인계 HANDOFF.md 생성"""
+    from claude_config.handoff_generator import HandoffGenerator
+
     generator = HandoffGenerator()
 
     if args.quick:
@@ -353,20 +376,9 @@ def main():
 
     args = parser.parse_args()
 
-    # claude-md 기본값 설정
+    # claude-md 기본값 설정 (learn 명령만 사용)
     if hasattr(args, 'claude_md') and args.claude_md is None:
-        # 현재 디렉토리 또는 프로젝트 루트에서 CLAUDE.md 찾기
-        cwd = Path.cwd()
-        if (cwd / "CLAUDE.md").exists():
-            args.claude_md = str(cwd / "CLAUDE.md")
-        else:
-            # 상위 디렉토리 탐색
-            for parent in cwd.parents:
-                if (parent / "CLAUDE.md").exists():
-                    args.claude_md = str(parent / "CLAUDE.md")
-                    break
-            else:
-                args.claude_md = str(cwd / "CLAUDE.md")
+        args.claude_md = str(find_claude_md(Path.cwd()))
 
     if args.command == "init":
         init_command(args)
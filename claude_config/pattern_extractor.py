@@ -5,13 +5,93 @@
 
 import re
 from collections import Counter
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from claude_config.log_analyzer import Conversation, Message, content_text
+
+# 키워드 중 하나만 포함되면 되는 요청 유형은 정규식 없이 소문자 문자열에서 `in`으로 검사
+_REQUEST_KEYWORDS = (
+    ("코드 리뷰", ("리뷰", "review", "검토", "확인")),
+    ("설명 요청", ("설명", "explain", "알려", "뭐야", "무엇")),
+    ("테스트", ("테스트", "test", "실행", "run")),
+    ("커밋", ("커밋", "commit", "푸시", "push")),
+    ("검색", ("찾아", "검색", "search", "find", "어디")),
+)
+
+# 기준 단어 앞에 앞 키워드가 있거나 뒤에 뒤 키워드가 있으면 매칭되는 요청 유형
+# ("(만들어|...).*파일|파일.*(만들어|생성)" 같은 정규식을 find/rfind로 대신함)
+# (유형, 앞 키워드, 기준 단어, 뒤 키워드)
+_ORDERED_REQUESTS = (
+    ("파일 생성", ("만들어", "생성", "create", "write"), "파일", ("만들어", "생성")),
+    ("파일 수정", ("수정", "변경", "edit", "modify"), "파일", ("수정", "변경")),
+)
+
+# 디버깅 요청만 정규식 사용
+# (소문자로 작성하고 소문자로 바꾼 내용에 검색하므로 re.IGNORECASE 불필요)
+# 각 대안이 리터럴로 시작하고 '.*'가 하나뿐이라 백트래킹이 메시지 길이에 비례하는
+# 수준이어서 re2 같은 외부 DFA 엔진은 쓰지 않음 (런타임 의존성 없음 유지)
+_DEBUG_REQUEST_RE = re.compile(r"(에러|error|버그|bug|왜.*안|안.*되|fix)")
+
+# 결과에 나오는 유형 순서 (빈도가 같을 때 most_common 순서를 유지하기 위함)
+_REQUEST_ORDER = (
+    "파일 생성", "파일 수정", "코드 리뷰", "설명 요청",
+    "테스트", "커밋", "검색", "디버깅",
+)
+
+# 사용자 메시지에서 직전 AI 응답을 교정한 것으로 보는 키워드
+_CORRECTION_KEYWORDS = (
+    "아니", "그게 아니라", "잘못", "틀렸", "다시",
+    "이렇게 말고", "그렇게 하지 말고", "반말", "존댓말",
+)
+
+
+def _has_ordered(text: str, before: tuple[str, ...], anchor: str, after: tuple[str, ...]) -> bool:
+    """before 키워드 ... anchor 또는 anchor ... after 키워드 순서로 나오는지 확인"""
+    last_anchor = text.rfind(anchor)
+    if last_anchor == -1:
+        return False
+    if any(text.find(keyword, 0, last_anchor) != -1 for keyword in before):
+        return True
+    first_end = text.find(anchor) + len(anchor)
+    return any(text.find(keyword, first_end) != -1 for keyword in after)
+
+
+@dataclass(slots=True)
+class _EditSummary:
+    """Edit 도구 입력을 확장자별 빈도와 앞쪽 편집 몇 개로만 누적
+
+    편집 전체를 목록으로 들고 있지 않고, 잘라낸 old/new 문자열도
+    recent_edits에 남는 것만 만듦
+    """
+    recent_limit: int = 5
+    total: int = 0
+    extensions: Counter = field(default_factory=Counter)
+    recent: list[dict] = field(default_factory=list)
+
+    def add(self, edit_inputs: list[dict]) -> None:
+        self.total += len(edit_inputs)
 
-from claude_config.log_analyzer import Conversation, Message
+        # 파일 확장자별 편집 빈도
+        paths = (input_data.get("file_path", "") for input_data in edit_inputs)
+        self.extensions.update(path.rsplit(".", 1)[1] for path in paths if "." in path)
+
+        for input_data in edit_inputs[:self.recent_limit - len(self.recent)]:
+            self.recent.append({
+                "file_path": input_data.get("file_path", ""),
+                "old_string": input_data.get("old_string", "")[:100],
+                "new_string": input_data.get("new_string", "")[:100],
+            })
+
+    def to_dict(self) -> dict:
+        return {
+            "total_edits": self.total,
+            "by_extension": dict(self.extensions.most_common(10)),
+            "recent_edits": self.recent,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Pattern:
     category: str  # "mistake", "preference", "workflow", "convention"
     description: str
@@ -21,29 +101,10 @@ class Pattern:
 
 
 class PatternExtractor:
-    def __init__(self):
-        self.mistake_patterns = [
-            {
-                "pattern": r"(수정|고쳐|변경|바꿔).*(다시|다시금)",
-                "category": "mistake",
-                "description": "코드 수정 후 다시 수정 요청"
-            },
-            {
-                "pattern": r"아니[야요]|그게 아니라|잘못",
-                "category": "mistake",
-                "description": "AI 응답 오류 지적"
-            },
-            {
-                "pattern": r"반말.*(하지|마)|존댓말",
-                "category": "preference",
-                "description": "말투 선호"
-            },
-            {
-                "pattern": r"한글|영어|Korean|English",
-                "category": "preference",
-                "description": "언어 선호"
-            },
-        ]
+    def __init__(self, store_responses: bool = False):
+        # 교정 항목에 직전 AI 응답(assistant_response)도 저장할지 여부
+        # (규칙 제안은 keyword/user_correction만 쓰므로 분석 결과를 내보낼 때만 필요)
+        self.store_responses = store_responses
 
         self.workflow_indicators = [
             "먼저", "그 다음", "그리고", "마지막으로",
@@ -51,138 +112,119 @@ class PatternExtractor:
             "plan", "계획", "순서"
         ]
 
-        self.code_style_patterns = [
-            {
-                "pattern": r"camelCase|PascalCase|snake_case|kebab-case",
-                "category": "convention",
-                "description": "네이밍 컨벤션"
-            },
-            {
-                "pattern": r"TypeScript|JavaScript|Python|한글.*주석|영어.*주석",
-                "category": "convention",
-                "description": "언어/주석 선호"
-            },
-        ]
+    def _analyze_conversation(self, conv: Conversation) -> dict:
+        """대화 하나를 한 번만 순회하며 교정/요청 유형/Edit/도구 시퀀스를 함께 추출"""
+        corrections = []
+        request_types = []
+        edit_inputs = []
+        tool_sequence = []
+
+        prev_assistant_msg = None
+        for msg in conv.messages:
+            if msg.role == "assistant":
+                prev_assistant_msg = msg
+                # 도구 호출 없는 텍스트 응답이 대부분이라 빈 리스트 순회를 건너뜀
+                if not msg.tool_calls:
+                    continue
+                for tool in msg.tool_calls:
+                    name = tool.get("name", "unknown")
+                    tool_sequence.append(name)
+                    if name == "Edit":
+                        edit_inputs.append(tool.get("input", {}))
+            elif msg.role == "user":
+                # 메시지마다 한 번만 정규화해서 모든 추출에 재사용
+                content = content_text(msg.content)
+                content_lower = content.lower()
+
+                request_types.extend(self._match_request_types(content_lower))
+
+                if prev_assistant_msg:
+                    correction = self._match_correction(content, content_lower, prev_assistant_msg)
+                    if correction:
+                        corrections.append(correction)
+
+        # 3개 이상의 도구 시퀀스를 워크플로우로 기록
+        workflow = None
+        if len(tool_sequence) >= 3:
+            workflow = {
+                "session_id": conv.session_id,
+                "sequence": tool_sequence[:10],
+                "length": len(tool_sequence)
+            }
+
+        return {
+            "corrections": corrections,
+            "request_types": request_types,
+            "edit_inputs": edit_inputs,
+            "workflow": workflow,
+            "tool_sequence": tool_sequence,
+        }
 
     def extract_edit_patterns(self, conversations: list[Conversation]) -> list[dict]:
         """Edit 도구 사용 패턴 분석"""
-        edits = []
-
+        summary = _EditSummary()
         for conv in conversations:
-            for msg in conv.messages:
-                if msg.role == "assistant":
-                    for tool in msg.tool_calls:
-                        if tool.get("name") == "Edit":
-                            input_data = tool.get("input", {})
-                            edits.append({
-                                "file_path": input_data.get("file_path", ""),
-                                "old_string": input_data.get("old_string", "")[:100],
-                                "new_string": input_data.get("new_string", "")[:100],
-                            })
-
-        # 파일 확장자별 편집 빈도
-        extensions = Counter()
-        for edit in edits:
-            path = edit.get("file_path", "")
-            if "." in path:
-                ext = path.split(".")[-1]
-                extensions[ext] += 1
-
-        return {
-            "total_edits": len(edits),
-            "by_extension": dict(extensions.most_common(10)),
-            "recent_edits": edits[:5]
-        }
+            summary.add(self._analyze_conversation(conv)["edit_inputs"])
+        return summary.to_dict()
 
     def extract_user_corrections(self, conversations: list[Conversation]) -> list[Pattern]:
         """사용자가 AI를 교정한 패턴 추출"""
-        corrections = []
-
-        correction_keywords = [
-            "아니", "그게 아니라", "잘못", "틀렸", "다시",
-            "이렇게 말고", "그렇게 하지 말고", "반말", "존댓말"
+        return [
+            c for conv in conversations
+            for c in self._analyze_conversation(conv)["corrections"]
         ]
 
-        for conv in conversations:
-            prev_assistant_msg = None
-            for msg in conv.messages:
-                if msg.role == "assistant":
-                    prev_assistant_msg = msg
-                elif msg.role == "user" and prev_assistant_msg:
-                    # content 타입 정규화
-                    content = msg.content
-                    if isinstance(content, list):
-                        content = " ".join(str(item) for item in content)
-                    elif not isinstance(content, str):
-                        content = str(content)
-
-                    prev_content = prev_assistant_msg.content
-                    if isinstance(prev_content, list):
-                        prev_content = " ".join(str(item) for item in prev_content)
-                    elif not isinstance(prev_content, str):
-                        prev_content = str(prev_content) if prev_content else ""
-
-                    # 사용자 메시지에 교정 키워드가 있는지 확인
-                    content_lower = content.lower()
-                    for keyword in correction_keywords:
-                        if keyword in content_lower:
-                            corrections.append({
-                                "user_correction": content[:200],
-                                "assistant_response": prev_content[:200] if prev_content else "[tool calls only]",
-                                "keyword": keyword
-                            })
-                            break
-
-        return corrections
+    def _match_correction(
+        self,
+        content: str,
+        content_lower: str,
+        prev_assistant_msg: Message
+    ) -> Optional[dict]:
+        """직전 AI 응답에 대한 사용자 교정 (교정 키워드가 없으면 None)"""
+        # 사용자 메시지에 있는 첫 번째 교정 키워드
+        keyword = next((k for k in _CORRECTION_KEYWORDS if k in content_lower), None)
+        if keyword is None:
+            return None
+
+        correction = {"user_correction": content[:200]}
+        if self.store_responses:
+            prev_content = content_text(prev_assistant_msg.content)
+            correction["assistant_response"] = prev_content[:200] if prev_content else "[tool calls only]"
+        correction["keyword"] = keyword
+        return correction
 
     def extract_repeated_requests(self, conversations: list[Conversation]) -> dict:
         """반복되는 요청 패턴 추출"""
         request_types = Counter()
+        for conv in conversations:
+            request_types.update(self._analyze_conversation(conv)["request_types"])
 
-        request_patterns = {
-            "파일 생성": r"(만들어|생성|create|write).*파일|파일.*(만들어|생성)",
-            "파일 수정": r"(수정|변경|edit|modify).*파일|파일.*(수정|변경)",
-            "코드 리뷰": r"(리뷰|review|검토|확인)",
-            "설명 요청": r"(설명|explain|알려|뭐야|무엇)",
-            "테스트": r"(테스트|test|실행|run)",
-            "커밋": r"(커밋|commit|푸시|push)",
-            "검색": r"(찾아|검색|search|find|어디)",
-            "디버깅": r"(에러|error|버그|bug|왜.*안|안.*되|fix)",
+        return dict(request_types.most_common())
+
+    def _match_request_types(self, content_lower: str) -> list[str]:
+        """소문자로 바꾼 사용자 메시지 하나에서 매칭된 요청 유형 (유형마다 한 번)"""
+        found = {
+            req_type for req_type, keywords in _REQUEST_KEYWORDS
+            if any(keyword in content_lower for keyword in keywords)
         }
+        found.update(
+            req_type for req_type, before, anchor, after in _ORDERED_REQUESTS
+            if _has_ordered(content_lower, before, anchor, after)
+        )
 
-        for conv in conversations:
-            for msg in conv.messages:
-                if msg.role == "user":
-                    content = msg.content
-                    if isinstance(content, list):
-                        content = " ".join(str(item) for item in content)
-                    elif not isinstance(content, str):
-                        content = str(content)
-
-                    for req_type, pattern in request_patterns.items():
-                        if re.search(pattern, content, re.IGNORECASE):
-                            request_types[req_type] += 1
+        if _DEBUG_REQUEST_RE.search(content_lower):
+            found.add("디버깅")
 
-        return dict(request_types.most_common())
+        return [req_type for req_type in _REQUEST_ORDER if req_type in found]
 
     def extract_workflow_patterns(self, conversations: list[Conversation]) -> list[dict]:
         """작업 흐름 패턴 추출"""
         workflows = []
 
         for conv in conversations:
-            tool_sequence = []
-            for msg in conv.messages:
-                if msg.role == "assistant":
-                    for tool in msg.tool_calls:
-                        tool_sequence.append(tool.get("name"))
-
-            if len(tool_sequence) >= 3:
-                # 3개 이상의 도구 시퀀스를 워크플로우로 기록
-                workflows.append({
-                    "session_id": conv.session_id,
-                    "sequence": tool_sequence[:10],
-                    "length": len(tool_sequence)
-                })
+            workflow = self._analyze_conversation(conv)["workflow"]
+            if workflow:
+                workflows.append(workflow)
 
         return workflows
 
@@ -205,29 +247,55 @@ class PatternExtractor:
         requests = patterns.get("repeated_requests", {})
         top_requests = list(requests.items())[:3]
         if top_requests:
-            workflow_suggestion = "## 자주 하는 작업\n"
-            for req_type, count in top_requests:
-                workflow_suggestion += f"- {req_type}: {count}회\n"
-            suggestions.append(workflow_suggestion)
+            suggestions.append("## 자주 하는 작업\n" + "".join(
+                f"- {req_type}: {count}회\n" for req_type, count in top_requests
+            ))
 
         # 파일 편집 패턴에서 규칙 생성
         edit_patterns = patterns.get("edit_patterns", {})
         by_extension = edit_patterns.get("by_extension", {})
         if by_extension:
-            ext_suggestion = "## 주요 작업 파일 유형\n"
-            for ext, count in list(by_extension.items())[:5]:
-                ext_suggestion += f"- .{ext}: {count}회 편집\n"
-            suggestions.append(ext_suggestion)
+            suggestions.append("## 주요 작업 파일 유형\n" + "".join(
+                f"- .{ext}: {count}회 편집\n" for ext, count in list(by_extension.items())[:5]
+            ))
 
         return suggestions
 
-    def analyze(self, conversations: list[Conversation]) -> dict:
-        """전체 패턴 분석 실행"""
+    def analyze(
+        self,
+        conversations: Iterable[Conversation],
+        tool_top_k: Optional[int] = None
+    ) -> dict:
+        """전체 패턴 분석 실행
+
+        대화를 한 번에 하나씩 처리하므로 generator를 넘기면 전체 목록을
+        메모리에 올리지 않음. 도구 사용 빈도(tool_usage)도 같은 순회에서 집계
+        """
+        corrections = []
+        request_types = Counter()
+        edit_summary = _EditSummary()
+        workflows = []
+        tool_counts = Counter()
+        conversation_count = 0
+
+        for conv in conversations:
+            conversation_count += 1
+            result = self._analyze_conversation(conv)
+            corrections.extend(result["corrections"])
+            request_types.update(result["request_types"])
+            edit_summary.add(result["edit_inputs"])
+            if result["workflow"]:
+                workflows.append(result["workflow"])
+
+            tool_counts.update(result["tool_sequence"])
+
         return {
-            "corrections": self.extract_user_corrections(conversations),
-            "repeated_requests": self.extract_repeated_requests(conversations),
-            "edit_patterns": self.extract_edit_patterns(conversations),
-            "workflows": self.extract_workflow_patterns(conversations),
+            "corrections": corrections,
+            "repeated_requests": dict(request_types.most_common()),
+            "edit_patterns": edit_summary.to_dict(),
+            "workflows": workflows,
+            "tool_usage": dict(tool_counts.most_common(tool_top_k)),
+            "conversation_count": conversation_count,
         }
 
 
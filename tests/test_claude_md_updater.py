@@ -4,7 +4,11 @@ ClaudeMdUpdater 테스트
 
 import pytest
 
-from claude_config.claude_md_updater import ClaudeMdUpdater, UpdateSuggestion
+from claude_config.claude_md_updater import (
+    ClaudeMdUpdater,
+    UpdateSuggestion,
+    count_tone_corrections,
+)
 
 
 class TestClaudeMdUpdater:
@@ -36,6 +40,16 @@ class TestClaudeMdUpdater:
         assert "# CLAUDE.md" in content
         assert "영구 규칙" in content
 
+    def test_read_claude_md_reloads_on_change(self, updater):
+        """파일 변경 시 캐시 대신 새 내용 읽기 테스트"""
+        assert "영구 규칙" in updater.read_claude_md()
+
+        updater.claude_md_path.write_text("# 새 내용\n", encoding="utf-8")
+        assert updater.read_claude_md() == "# 새 내용\n"
+
+        updater.claude_md_path.unlink()
+        assert updater.read_claude_md() == ""
+
     def test_parse_sections(self, updater):
         """섹션 파싱 테스트"""
         content = updater.read_claude_md()
@@ -46,6 +60,17 @@ class TestClaudeMdUpdater:
         assert "recent" in sections
         assert "deprecated" in sections
 
+    def test_parse_sections_content(self, updater):
+        """섹션별 내용 분리 테스트"""
+        sections = updater.parse_sections(updater.read_claude_md())
+
+        assert "# CLAUDE.md" in sections["other"]
+        assert "기존 규칙 1" in sections["permanent"]
+        assert "패턴 1" in sections["validated"]
+        assert "최근 항목 1" in sections["recent"]
+        assert "삭제 예정 항목" in sections["deprecated"]
+        assert "최근 항목 1" not in sections["permanent"]
+
     def test_check_duplicate_rule(self, updater):
         """중복 규칙 확인 테스트"""
         existing = "항상 존댓말을 사용합니다. 반말 금지."
@@ -58,6 +83,21 @@ class TestClaudeMdUpdater:
         different = "TypeScript를 사용합니다."
         assert updater.check_duplicate_rule(existing, different) is False
 
+    def test_check_duplicate_rule_ignores_mid_word_match(self, updater):
+        """단어 중간에 포함된 키워드는 일치로 보지 않음"""
+        existing = "Concatenate strings with join."
+
+        assert updater.check_duplicate_rule(existing, "cat ate") is False
+        assert updater.check_duplicate_rule(existing, "concat strings") is True
+
+    def test_check_duplicate_rule_long_section(self, updater):
+        """긴 섹션 안에 있는 규칙도 중복으로 판단"""
+        unrelated = "\n".join(f"- unrelated rule number{i} about topic{i}" for i in range(200))
+        existing = f"{unrelated}\n- 항상 존댓말을 사용합니다. 반말 금지.\n"
+
+        assert updater.check_duplicate_rule(existing, "존댓말 사용, 반말 금지") is True
+        assert updater.check_duplicate_rule(existing, "TypeScript를 사용합니다.") is False
+
     def test_generate_suggestions_with_corrections(self, updater):
         """교정 패턴에서 제안 생성 테스트"""
         patterns = {
@@ -88,6 +128,58 @@ class TestClaudeMdUpdater:
 
         assert len(suggestions) >= 1
 
+    def test_generate_suggestions_with_workflows(self, updater):
+        """도구 시퀀스에서 작업 패턴 제안 생성 테스트"""
+        patterns = {
+            "corrections": [],
+            "repeated_requests": {},
+            "edit_patterns": {"by_extension": {}},
+            "workflows": [{"sequence": ["Read", "Edit", "Bash"]} for _ in range(3)],
+        }
+
+        suggestions = updater.generate_suggestions(patterns)
+
+        assert len(suggestions) == 1
+        assert "- Read → Edit: 3회" in suggestions[0].content
+        assert "- Edit → Bash: 3회" in suggestions[0].content
+
+    def test_generate_suggestions_with_today(self, updater):
+        """지정한 날짜로 제안 생성 테스트"""
+        patterns = {"repeated_requests": {"파일 생성": 10}}
+
+        suggestions = updater.generate_suggestions(patterns, today="2026-01-02")
+
+        assert suggestions[0].content.startswith("### [2026-01-02]")
+
+    def test_apply_suggestions_dry_run(self, updater):
+        """미리보기 모드는 파일을 바꾸지 않음"""
+        original = updater.read_claude_md()
+        suggestion = UpdateSuggestion(
+            section="recent", content="### 새 규칙\n- 린트 먼저 실행\n", reason="테스트", priority=2
+        )
+
+        result = updater.apply_suggestions([suggestion], dry_run=True)
+
+        assert result == original
+        assert updater.claude_md_path.read_text(encoding="utf-8") == original
+
+    def test_apply_suggestions_writes_to_section(self, updater):
+        """제안이 해당 섹션 끝에 추가되고 중복은 건너뜀"""
+        suggestions = [
+            UpdateSuggestion(
+                section="recent", content="### 새 규칙\n- 린트 먼저 실행\n", reason="테스트", priority=2
+            ),
+            UpdateSuggestion(section="permanent", content="- 기존 규칙 1", reason="중복", priority=1),
+        ]
+
+        result = updater.apply_suggestions(suggestions, dry_run=False)
+
+        assert updater.claude_md_path.read_text(encoding="utf-8") == result
+        sections = updater.parse_sections(result)
+        assert "- 린트 먼저 실행" in sections["recent"]
+        assert "최근 항목 1" in sections["recent"]
+        assert sections["permanent"].count("기존 규칙 1") == 1
+
     def test_get_update_report(self, updater):
         """업데이트 리포트 생성 테스트"""
         patterns = {
@@ -118,3 +210,20 @@ class TestUpdateSuggestion:
         assert suggestion.section == "recent"
         assert suggestion.priority == 2
         assert "테스트 규칙" in suggestion.content
+
+
+
+class TestCountToneCorrections:
+    """count_tone_corrections 함수 테스트"""
+
+    def test_count(self):
+        """말투 관련 교정 횟수 테스트"""
+        corrections = [
+            {"keyword": "반말"},
+            {"keyword": "존댓말"},
+            {"keyword": "아니"},
+            {},
+        ]
+
+        assert count_tone_corrections(corrections) == 2
+        assert count_tone_corrections([]) == 0
@@ -2,6 +2,8 @@
 ConfigGenerator 테스트
 """
 
+import os
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -16,6 +18,14 @@ class TestConfigGenerator:
         """ConfigGenerator 인스턴스 생성"""
         return ConfigGenerator()
 
+    def test_analyzer_created_lazily(self, generator):
+        """로그 분석기는 처음 사용할 때 생성"""
+        assert generator._analyzer is None
+        assert generator._extractor is None
+
+        assert generator.analyzer is generator.analyzer
+        assert generator.extractor is generator.extractor
+
     def test_generate_claude_md_basic(self, generator):
         """기본 CLAUDE.md 생성 테스트"""
         answers = {
@@ -52,6 +62,19 @@ class TestConfigGenerator:
         assert "명시적인 타입 선언" in content
         assert "FastAPI" in content
 
+    def test_generate_claude_md_unknown_choices(self, generator):
+        """알 수 없는 말투/스타일은 영어/밸런스로 처리"""
+        answers = {
+            "languages": ["Go"],
+            "tone": "기타",
+            "code_style": "기타",
+        }
+
+        content = generator.generate_claude_md(answers, {})
+
+        assert "- Respond in English." in content
+        assert "간결함과 명확함의 균형" in content
+
     def test_generate_claude_md_with_analysis(self, generator):
         """분석 결과 포함 CLAUDE.md 생성 테스트"""
         answers = {
@@ -74,12 +97,29 @@ class TestConfigGenerator:
         assert "파일 생성" in content
         assert "주요 파일: .ts" in content
 
+    def test_generate_claude_md_top_requests_by_count(self, generator):
+        """반복 요청은 입력 순서가 아니라 횟수 기준 상위 2개만 포함"""
+        answers = {
+            "languages": ["Python"],
+            "frameworks": [],
+            "tone": "존댓말",
+            "code_style": "밸런스",
+            "extra_rules": None,
+        }
+        analysis = {"repeated_requests": {"검색": 1, "테스트": 7, "커밋": 4}}
+
+        content = generator.generate_claude_md(answers, analysis)
+
+        assert "- 테스트: 7회 반복" in content
+        assert "- 커밋: 4회 반복" in content
+        assert "검색" not in content
+
     def test_init_with_skip_questions(self, generator, tmp_path):
         """질문 스킵 초기화 테스트"""
         output = tmp_path / "CLAUDE.md"
 
         # LogAnalyzer 모킹
-        with patch.object(generator.analyzer, 'get_recent_conversations', return_value=[]):
+        with patch.object(generator.analyzer, 'iter_recent_conversations', return_value=iter([])):
             result = generator.init(output_path=str(output), skip_questions=True)
 
         assert output.exists()
@@ -89,11 +129,64 @@ class TestConfigGenerator:
 
     def test_analyze_existing_logs_empty(self, generator):
         """로그 없을 때 분석 테스트"""
-        with patch.object(generator.analyzer, 'get_recent_conversations', return_value=[]):
+        with patch.object(generator.analyzer, 'iter_recent_conversations', return_value=iter([])):
             result = generator.analyze_existing_logs()
 
         assert result == {}
 
+    def test_detect_project_type(self, generator, tmp_path, monkeypatch):
+        """프로젝트 파일로 언어/프레임워크 감지 테스트"""
+        (tmp_path / "pyproject.toml").write_text("")
+        (tmp_path / "requirements.txt").write_text("")
+        (tmp_path / "package.json").write_text('{"dependencies": {"react": "18"}}')
+        (tmp_path / "go.mod").mkdir()  # 디렉토리는 감지 대상 아님
+        monkeypatch.chdir(tmp_path)
+
+        detected = generator.detect_project_type()
+
+        assert detected["languages"] == ["JavaScript/TypeScript", "Python"]
+        assert detected["frameworks"] == ["Node.js", "React"]
+
+    def test_detect_project_type_sees_package_json_changes(self, generator, tmp_path, monkeypatch):
+        """package.json 내용이 바뀌면 캐시 대신 다시 감지"""
+        package_json = tmp_path / "package.json"
+        package_json.write_text('{"dependencies": {}}')
+        monkeypatch.chdir(tmp_path)
+        assert generator.detect_project_type()["frameworks"] == ["Node.js"]
+
+        package_json.write_text('{"dependencies": {"vue": "3"}}')
+        stat = package_json.stat()
+        os.utime(package_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert generator.detect_project_type()["frameworks"] == ["Node.js", "Vue"]
+
+        # 반환값을 수정해도 캐시에 영향 없음
+        generator.detect_project_type()["frameworks"].append("X")
+        assert generator.detect_project_type()["frameworks"] == ["Node.js", "Vue"]
+
+    def test_detect_project_type_same_mtime_different_size(self, generator, tmp_path, monkeypatch):
+        """mtime이 그대로여도 package.json 크기가 바뀌면 다시 감지"""
+        package_json = tmp_path / "package.json"
+        package_json.write_text('{"dependencies": {}}')
+        stat = package_json.stat()
+        monkeypatch.chdir(tmp_path)
+        assert generator.detect_project_type()["frameworks"] == ["Node.js"]
+
+        package_json.write_text('{"dependencies": {"react": "18"}}')
+        os.utime(package_json, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert generator.detect_project_type()["frameworks"] == ["Node.js", "React"]
+
+    def test_detect_project_type_invalid_package_json(self, generator, tmp_path, monkeypatch):
+        """깨진 package.json은 세부 감지만 건너뛰기"""
+        (tmp_path / "package.json").write_text("{not json")
+        monkeypatch.chdir(tmp_path)
+
+        detected = generator.detect_project_type()
+
+        assert detected["languages"] == ["JavaScript/TypeScript"]
+        assert detected["frameworks"] == ["Node.js"]
+
     def test_code_style_options(self, generator):
         """코드 스타일 옵션별 생성 테스트"""
         base_answers = {
@@ -0,0 +1,88 @@
+"""
+file_utils 테스트
+"""
+
+import json
+import os
+
+import pytest
+
+from claude_config import file_utils
+from claude_config.file_utils import (
+    atomic_write_bytes,
+    atomic_write_text,
+    is_unchanged,
+    json_dumps_pretty,
+    json_loads,
+)
+
+
+class TestAtomicWrite:
+    """원자적 파일 저장 테스트"""
+
+    def test_write_new_file(self, tmp_path):
+        """새 파일 저장 테스트"""
+        path = tmp_path / "CLAUDE.md"
+
+        assert atomic_write_text(path, "# 제목\n") is True
+        assert path.read_text(encoding="utf-8") == "# 제목\n"
+        assert list(tmp_path.iterdir()) == [path]  # 임시 파일이 남지 않음
+
+    def test_skip_unchanged(self, tmp_path):
+        """내용이 같으면 쓰지 않음"""
+        path = tmp_path / "CLAUDE.md"
+        atomic_write_text(path, "same")
+        mtime = path.stat().st_mtime_ns
+
+        assert atomic_write_text(path, "same") is False
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_overwrite_keeps_mode(self, tmp_path):
+        """덮어쓸 때 기존 파일 권한 유지"""
+        path = tmp_path / "settings.json"
+        path.write_bytes(b"old")
+        os.chmod(path, 0o600)
+
+        assert atomic_write_bytes(path, b"new") is True
+        assert path.read_bytes() == b"new"
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_write_through_symlink(self, tmp_path):
+        """심볼릭 링크는 유지하고 대상 파일을 갱신"""
+        target = tmp_path / "AGENTS.md"
+        target.write_text("old", encoding="utf-8")
+        link = tmp_path / "CLAUDE.md"
+        link.symlink_to(target.name)
+
+        assert atomic_write_text(link, "new") is True
+        assert link.is_symlink()
+        assert target.read_text(encoding="utf-8") == "new"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["AGENTS.md", "CLAUDE.md"]
+
+    def test_is_unchanged_missing_file(self, tmp_path):
+        """없는 파일은 변경된 것으로 판단"""
+        assert is_unchanged(tmp_path / "missing.md", b"") is False
+
+
+class TestJson:
+    """JSON 헬퍼 테스트"""
+
+    SETTINGS = {"hooks": {"postToolUse": [{"matcher": "Edit", "hooks": []}]}, "메모": "한글"}
+
+    def test_roundtrip(self):
+        """인코딩 후 디코딩하면 원래 값"""
+        assert json_loads(json_dumps_pretty(self.SETTINGS)) == self.SETTINGS
+
+    def test_stdlib_fallback_format(self, monkeypatch):
+        """orjson이 없으면 표준 json과 같은 형식"""
+        monkeypatch.setattr(file_utils, "orjson", None)
+
+        data = json_dumps_pretty(self.SETTINGS)
+
+        assert data == json.dumps(self.SETTINGS, indent=2, ensure_ascii=False).encode("utf-8")
+        assert json_loads(data) == self.SETTINGS
+
+    def test_invalid_json_raises_value_error(self):
+        """잘못된 JSON은 ValueError"""
+        with pytest.raises(ValueError):
+            json_loads(b"{not json")
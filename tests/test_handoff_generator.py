@@ -56,6 +56,16 @@ class TestHandoffGenerator:
         assert latest is not None
         assert latest.name == "test-session-123.jsonl"
 
+    def test_create_handoff_by_session_id(self, generator, sample_session, tmp_path):
+        """세션 ID를 지정하면 해당 세션으로 HANDOFF.md 생성"""
+        output = tmp_path / "HANDOFF.md"
+
+        result = generator.create_handoff(output_path=str(output), session_id="test-session-123")
+
+        assert result == str(output)
+        assert "세션 ID: test-session-123" in output.read_text(encoding="utf-8")
+        assert generator.create_handoff(output_path=str(output), session_id="unknown") == ""
+
     def test_extract_context_from_session(self, generator, sample_session):
         """세션에서 컨텍스트 추출 테스트"""
         context = generator.extract_context_from_session(sample_session)
@@ -64,6 +74,40 @@ class TestHandoffGenerator:
         assert context.summary is not None
         assert "app.py" in context.important_files or "test_app.py" in context.important_files
 
+    def test_extract_context_tasks_and_summary(self, generator, sample_session):
+        """요약/완료/남은 작업 추출 테스트"""
+        context = generator.extract_context_from_session(sample_session)
+
+        assert context.summary == "파일을 생성해줘"
+        assert context.completed_tasks == ["테스트 완료했습니다."]
+        assert context.pending_tasks == ["파일을 생성해줘", "테스트도 작성해줘"]
+        assert context.next_steps == ["파일을 생성해줘", "테스트도 작성해줘"]
+
+    def test_extract_context_keeps_last_five_unique(self, generator, tmp_path):
+        """남은 작업은 중복 없이 최근 5개만 유지"""
+        requests = ["작업 0 해줘"] + [f"작업 {i} 해줘" for i in range(1, 8)] + ["작업 0 해줘"]
+        session_file = tmp_path / "long-session.jsonl"
+        session_file.write_text("\n".join(
+            json.dumps({"type": "user", "message": {"content": text}}) for text in requests
+        ))
+
+        context = generator.extract_context_from_session(session_file)
+
+        assert context.pending_tasks == [f"작업 {i} 해줘" for i in range(3, 8)]
+
+    def test_extract_context_list_content(self, generator, tmp_path):
+        """list 형태 content에서는 텍스트 블록만 사용"""
+        session_file = tmp_path / "blocks.jsonl"
+        session_file.write_text(json.dumps({"type": "user", "message": {"content": [
+            {"type": "tool_result", "tool_use_id": "x", "content": "로그 필요"},
+            {"type": "text", "text": "README 정리해줘"},
+        ]}}))
+
+        context = generator.extract_context_from_session(session_file)
+
+        assert context.summary == "README 정리해줘"
+        assert context.pending_tasks == ["README 정리해줘"]
+
     def test_generate_handoff_md(self, generator):
         """HANDOFF.md 생성 테스트"""
         context = HandoffContext(
@@ -3,6 +3,10 @@ HooksManager 테스트
 """
 
 import json
+import os
+import shutil
+import subprocess
+
 import pytest
 
 from claude_config.hooks_manager import HooksManager, Hook, HOOK_TEMPLATES
@@ -93,6 +97,33 @@ class TestHooksManager:
         assert all("matcher" in t for t in templates)
         assert all("command" in t for t in templates)
 
+    def test_write_settings_atomic(self, manager, tmp_path, monkeypatch):
+        """저장 중 실패해도 기존 settings.json 유지"""
+        manager.write_settings({"hooks": {"preToolUse": [], "postToolUse": []}})
+        before = manager.settings_path.read_bytes()
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail)
+        with pytest.raises(OSError):
+            manager.write_settings({"hooks": {}, "other": 1})
+
+        assert manager.settings_path.read_bytes() == before
+        assert os.listdir(tmp_path / ".claude") == ["settings.json"]
+
+    def test_write_settings_through_symlink(self, manager, tmp_path):
+        """settings.json이 심볼릭 링크면 대상 파일에 저장"""
+        target = tmp_path / "shared-settings.json"
+        target.write_text("{}")
+        manager.ensure_claude_dir()
+        manager.settings_path.symlink_to(target)
+
+        manager.init_hooks()
+
+        assert manager.settings_path.is_symlink()
+        assert "hooks" in json.loads(target.read_text())
+
     def test_suggest_hooks_python(self, manager, tmp_path):
         """Python 프로젝트 훅 추천 테스트"""
         (tmp_path / "pyproject.toml").write_text("[project]\nname='test'")
@@ -136,6 +167,19 @@ class TestHooksManager:
 
         assert "no-env-commit" in suggestions
 
+    def test_suggest_hooks_sees_new_files(self, manager, tmp_path):
+        """파일이 추가되면 캐시된 추천 대신 다시 계산"""
+        assert "lint-python" not in manager.suggest_hooks()
+
+        (tmp_path / "pyproject.toml").write_text("")
+
+        assert "lint-python" in manager.suggest_hooks()
+
+    def test_suggest_hooks_missing_project_dir(self, tmp_path):
+        """존재하지 않는 프로젝트 디렉토리는 추천 없음"""
+        manager = HooksManager(str(tmp_path / "missing"))
+        assert manager.suggest_hooks() == []
+
     def test_read_write_settings(self, manager, tmp_path):
         """설정 읽기/쓰기 테스트"""
         test_settings = {"key": "value", "nested": {"a": 1}}
@@ -161,6 +205,13 @@ class TestHook:
         assert hook.command == "pytest"
         assert hook.description == "테스트 실행"
 
+    def test_hook_is_frozen(self):
+        """템플릿은 변경 불가"""
+        hook = HOOK_TEMPLATES["lint-python"]
+
+        with pytest.raises(AttributeError):
+            hook.command = "echo"
+
 
 class TestHookTemplates:
     """Hook 템플릿 테스트"""
@@ -182,3 +233,23 @@ class TestHookTemplates:
         required = ["lint-python", "lint-js", "test-python", "test-js", "no-force-push"]
         for name in required:
             assert name in HOOK_TEMPLATES, f"Required template '{name}' not found"
+
+    @pytest.mark.skipif(shutil.which("sh") is None, reason="sh not available")
+    @pytest.mark.parametrize("name,command,returncode,warns", [
+        ("no-force-push", "git push --force origin main", 1, False),
+        ("no-force-push", "git push -f", 1, False),
+        ("no-force-push", "git push origin main", 0, False),
+        ("no-env-commit", "cat .env", 0, True),
+        ("no-env-commit", "ls -la", 0, False),
+    ])
+    def test_bash_guard_templates(self, name, command, returncode, warns):
+        """Bash 가드 템플릿이 셸 내장 명령만으로 동작하는지 확인"""
+        result = subprocess.run(
+            ["sh", "-c", HOOK_TEMPLATES[name].command],
+            env={**os.environ, "COMMAND": command},
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == returncode
+        assert ("Warning" in result.stdout) is warns
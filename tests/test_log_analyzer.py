@@ -3,11 +3,13 @@ LogAnalyzer 테스트
 """
 
 import json
+import os
 import tempfile
 from pathlib import Path
 
 import pytest
 
+from claude_config import log_analyzer
 from claude_config.log_analyzer import LogAnalyzer, Conversation, Message
 
 
@@ -43,6 +45,37 @@ class TestLogAnalyzer:
         assert entries[0]["type"] == "user"
         assert entries[1]["type"] == "assistant"
 
+    def test_parse_jsonl_skips_broken_lines(self, tmp_path):
+        """잘못된 JSON/UTF-8 줄은 건너뛰고 나머지는 파싱"""
+        test_file = tmp_path / "broken.jsonl"
+        test_file.write_bytes(
+            b'{"type": "user", "message": {"content": "\xec\x95\x88\xeb\x85\x95"}}\r\n'
+            b'{"type": \n'
+            b'\xff\xfe\n'
+            b'\n'
+            b'{"type": "assistant"}'
+        )
+
+        entries = list(LogAnalyzer().parse_jsonl(test_file))
+
+        assert entries == [
+            {"type": "user", "message": {"content": "안녕"}},
+            {"type": "assistant"},
+        ]
+
+    def test_parse_jsonl_mmap(self, tmp_path, monkeypatch):
+        """큰 파일(mmap 경로)도 같은 결과"""
+        monkeypatch.setattr(log_analyzer, "_MMAP_THRESHOLD", 1)
+        test_file = tmp_path / "large.jsonl"
+        test_file.write_text('{"a": 1}\n\nnot json\n{"b": 2}')
+        empty_file = tmp_path / "empty.jsonl"
+        empty_file.write_text("")
+
+        analyzer = LogAnalyzer()
+
+        assert list(analyzer.parse_jsonl(test_file)) == [{"a": 1}, {"b": 2}]
+        assert list(analyzer.parse_jsonl(empty_file)) == []
+
     def test_extract_conversation(self, tmp_path):
         """대화 추출 테스트"""
         # 테스트 세션 파일 생성
@@ -71,6 +104,44 @@ class TestLogAnalyzer:
         assert len(conv.messages[1].tool_calls) == 1
         assert conv.messages[1].tool_calls[0]["name"] == "Write"
 
+    def test_iter_messages(self, tmp_path):
+        """메시지 스트리밍 및 tool_result 연결 테스트"""
+        test_file = tmp_path / "stream.jsonl"
+        test_data = [
+            {"type": "user", "message": {"content": "읽어줘"}},
+            {"type": "assistant", "message": {"content": [{"type": "tool_use", "name": "Read", "input": {}}]}},
+            {"type": "tool_result", "content": "file body"},
+        ]
+        test_file.write_text("\n".join(json.dumps(d) for d in test_data))
+
+        analyzer = LogAnalyzer()
+        messages = list(analyzer.iter_messages(test_file))
+
+        assert [m.role for m in messages] == ["user", "assistant"]
+        assert messages[1].tool_results == ["file body"]
+
+    def test_extract_conversation_skips_files_without_messages(self, tmp_path, monkeypatch):
+        """user/assistant 항목이 없는 파일은 디코딩하지 않음 (블록 경계도 확인)"""
+        monkeypatch.setattr(log_analyzer, "_SCAN_CHUNK_SIZE", 8)
+        summary_only = tmp_path / "summary.jsonl"
+        summary_only.write_text(json.dumps({"type": "summary", "summary": "x" * 50}))
+        boundary = tmp_path / "boundary.jsonl"
+        boundary.write_text(json.dumps({"type": "assistant", "message": {"content": []}}))
+
+        analyzer = LogAnalyzer(claude_dir=str(tmp_path))
+        parse = analyzer.parse_jsonl
+        parsed = []
+
+        def counting_parse(path):
+            parsed.append(path.name)
+            return parse(path)
+
+        monkeypatch.setattr(analyzer, "parse_jsonl", counting_parse)
+
+        assert analyzer.extract_conversation(summary_only).messages == []
+        assert len(analyzer.extract_conversation(boundary).messages) == 1
+        assert parsed == ["boundary.jsonl"]
+
     def test_get_all_tool_usage(self):
         """도구 사용 집계 테스트"""
         conversations = [
@@ -90,6 +161,27 @@ class TestLogAnalyzer:
         assert tool_usage["Read"] == 2
         assert tool_usage["Write"] == 1
 
+    def test_get_all_tool_usage_top_k(self):
+        """상위 k개 도구만 집계 테스트"""
+        conversations = [
+            Conversation(
+                session_id="test",
+                project_path="/test",
+                messages=[
+                    Message(
+                        role="assistant",
+                        content="",
+                        tool_calls=[{"name": "Read"}, {"name": "Edit"}, {"name": "Read"}, {"name": "Bash"}],
+                    ),
+                ],
+            )
+        ]
+
+        analyzer = LogAnalyzer()
+        tool_usage = analyzer.get_all_tool_usage(conversations, top_k=2)
+
+        assert list(tool_usage.items()) == [("Read", 2), ("Edit", 1)]
+
     def test_get_user_patterns(self):
         """사용자 패턴 분석 테스트"""
         conversations = [
@@ -111,6 +203,105 @@ class TestLogAnalyzer:
         assert patterns["question_ratio"] > 0  # "?" 포함된 메시지 있음
         assert patterns["code_request_ratio"] > 0  # "코드" 포함된 메시지 있음
 
+    def test_get_user_patterns_code_keywords(self):
+        """코드 요청 키워드는 대소문자 구분 없이 메시지당 한 번만 집계"""
+        conversations = [
+            Conversation(
+                session_id="test",
+                project_path="/test",
+                messages=[
+                    Message(role="user", content="Please IMPLEMENT and write it"),
+                    Message(role="user", content="함수 구현"),
+                    Message(role="user", content="그냥 질문"),
+                    Message(role="assistant", content="code"),
+                ],
+            )
+        ]
+
+        patterns = LogAnalyzer().get_user_patterns(conversations)
+
+        assert patterns["code_request_ratio"] == 2 / 3
+
+    def test_get_session_files(self, tmp_path):
+        """프로젝트 디렉토리와 .jsonl 세션 파일만 최신순으로"""
+        project = tmp_path / "projects" / "p"
+        project.mkdir(parents=True)
+        (tmp_path / "projects" / "stray.txt").write_text("")
+        (project / "dir.jsonl").mkdir()
+        (project / "notes.txt").write_text("")
+        for i, name in enumerate(["old", "new"]):
+            session = project / f"{name}.jsonl"
+            session.write_text("")
+            os.utime(session, ns=(i * 10**9, i * 10**9))
+
+        analyzer = LogAnalyzer(claude_dir=str(tmp_path))
+
+        assert analyzer.get_all_project_dirs() == [project]
+        assert analyzer.get_session_files(project) == [project / "new.jsonl", project / "old.jsonl"]
+        assert LogAnalyzer(claude_dir=str(tmp_path / "missing")).get_all_project_dirs() == []
+
+    def test_get_recent_conversations(self, tmp_path):
+        """최신순으로 limit개까지, 빈 세션은 건너뜀"""
+        project = tmp_path / "projects" / "p"
+        project.mkdir(parents=True)
+        line = json.dumps({"type": "user", "message": {"content": "안녕"}})
+        for i in range(12):
+            session = project / f"s{i}.jsonl"
+            session.write_text("" if i % 3 == 0 else line)
+            os.utime(session, ns=(i * 10**9, i * 10**9))
+
+        analyzer = LogAnalyzer(claude_dir=str(tmp_path))
+
+        ids = [c.session_id for c in analyzer.get_recent_conversations(limit=5)]
+        assert ids == ["s11", "s10", "s8", "s7", "s5"]
+        assert len(analyzer.get_recent_conversations(limit=100)) == 8
+        assert analyzer.get_recent_conversations(project_filter="other") == []
+
+    def test_get_recent_conversations_across_projects(self, tmp_path):
+        """여러 프로젝트의 세션도 전체 최신순으로 반환"""
+        line = json.dumps({"type": "user", "message": {"content": "안녕"}})
+        for project, times in (("proj-x", (1, 4)), ("proj-y", (2, 3, 5))):
+            project_dir = tmp_path / "projects" / project
+            project_dir.mkdir(parents=True)
+            for t in times:
+                session = project_dir / f"{project}{t}.jsonl"
+                session.write_text(line)
+                os.utime(session, ns=(t * 10**9, t * 10**9))
+
+        analyzer = LogAnalyzer(claude_dir=str(tmp_path))
+
+        ids = [c.session_id for c in analyzer.get_recent_conversations(limit=3)]
+        assert ids == ["proj-y5", "proj-x4", "proj-y3"]
+        ids = [c.session_id for c in analyzer.get_recent_conversations(project_filter="proj-x")]
+        assert ids == ["proj-x4", "proj-x1"]
+
+    def test_find_session(self, tmp_path):
+        """세션 ID로 파일 찾기 (처음 조회 후 추가된 세션 포함)"""
+        project_a = tmp_path / "projects" / "a"
+        project_b = tmp_path / "projects" / "b"
+        project_a.mkdir(parents=True)
+        project_b.mkdir()
+        (project_a / "s1.jsonl").write_text("")
+        (project_b / "notes.txt").write_text("")
+
+        analyzer = LogAnalyzer(claude_dir=str(tmp_path))
+
+        assert analyzer.find_session("s1") == project_a / "s1.jsonl"
+        assert analyzer.find_session("missing") is None
+
+        (project_b / "s2.jsonl").write_text("")
+        assert analyzer.find_session("s2") == project_b / "s2.jsonl"
+
+    def test_content_text(self):
+        """content 정규화: list는 텍스트 블록만 연결하고 빈 값은 빈 문자열"""
+        assert log_analyzer.content_text("그대로") == "그대로"
+        assert log_analyzer.content_text([
+            {"type": "tool_result", "content": "출력"},
+            {"type": "text", "text": "README 정리해줘"},
+            "추가",
+        ]) == "README 정리해줘 추가"
+        assert log_analyzer.content_text(None) == ""
+
 
 class TestMessage:
     """Message 데이터클래스 테스트"""
@@ -123,6 +314,24 @@ class TestMessage:
         assert msg.tool_calls == []
         assert msg.tool_results == []
 
+    def test_message_slots(self):
+        """인스턴스마다 __dict__를 만들지 않음"""
+        msg = Message(role="user", content="Hello")
+        assert not hasattr(msg, "__dict__")
+
+        with pytest.raises(AttributeError):
+            msg.extra = 1
+
+    def test_message_default_lists_not_shared(self):
+        """기본 tool_calls/tool_results 리스트는 인스턴스마다 따로"""
+        first = Message(role="assistant", content="")
+        second = Message(role="assistant", content="")
+
+        first.tool_results.append("ok")
+
+        assert second.tool_results == []
+        assert first.tool_calls is not second.tool_calls
+
 
 class TestConversation:
     """Conversation 데이터클래스 테스트"""
@@ -137,3 +346,22 @@ class TestConversation:
         assert conv.session_id == "test-123"
         assert conv.project_path == "/test/project"
         assert len(conv.messages) == 1
+
+    def test_conversation_tool_names(self):
+        """assistant 메시지의 도구 이름을 순서대로 펼침"""
+        conv = Conversation(
+            session_id="test-123",
+            project_path="/test/project",
+            messages=[
+                Message(role="assistant", content="", tool_calls=[{"name": "Read"}, {}]),
+                Message(role="user", content="", tool_calls=[{"name": "Ignored"}]),
+                Message(role="assistant", content="", tool_calls=[{"name": "Edit"}]),
+            ],
+        )
+        assert conv.tool_names == ["Read", "unknown", "Edit"]
+        assert [t.get("name") for t in conv.iter_tool_calls()] == ["Read", None, "Edit"]
+        assert list(conv.iter_user_messages()) == [conv.messages[1]]
+
+        # 생성 후 추가된 메시지도 반영
+        conv.messages.append(Message(role="assistant", content="", tool_calls=[{"name": "Bash"}]))
+        assert conv.tool_names == ["Read", "unknown", "Edit", "Bash"]
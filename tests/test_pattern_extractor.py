@@ -59,6 +59,14 @@ class TestPatternExtractor:
         assert len(corrections) >= 1
         assert any("아니" in c.get("keyword", "") for c in corrections)
 
+    def test_extract_user_corrections_responses(self, sample_conversations):
+        """store_responses=True일 때만 직전 AI 응답을 저장"""
+        without = PatternExtractor().extract_user_corrections(sample_conversations)
+        assert all("assistant_response" not in c for c in without)
+
+        corrections = PatternExtractor(store_responses=True).extract_user_corrections(sample_conversations)
+        assert corrections[0]["assistant_response"] == "네, 생성하겠습니다."
+
     def test_extract_repeated_requests(self, extractor, sample_conversations):
         """반복 요청 추출 테스트"""
         requests = extractor.extract_repeated_requests(sample_conversations)
@@ -67,6 +75,38 @@ class TestPatternExtractor:
         # "파일 생성" 또는 "테스트" 키워드가 있어야 함
         assert any(key in ["파일 생성", "테스트"] for key in requests.keys())
 
+    @pytest.mark.parametrize("content, expected", [
+        ("파일 만들어서 테스트 실행하고 커밋해줘", ["파일 생성", "테스트", "커밋"]),
+        ("왜 이 파일 수정이 안 돼? error 확인 좀", ["파일 수정", "코드 리뷰", "디버깅"]),
+        ("README 어디 있는지 찾아서 설명해줘", ["설명 요청", "검색"]),
+        ("Please REVIEW and Push", ["코드 리뷰", "커밋"]),
+        ("Write a new 파일 please", ["파일 생성"]),
+        ("설정 파일을 create", []),
+        ("안녕하세요", []),
+    ])
+    def test_request_types(self, extractor, content, expected):
+        """메시지 하나에서 매칭되는 요청 유형 (유형마다 한 번, 정해진 순서)"""
+        conv = Conversation(
+            session_id="s", project_path="/test",
+            messages=[Message(role="user", content=content)],
+        )
+        assert extractor._analyze_conversation(conv)["request_types"] == expected
+
+    def test_analyze_duplicate_session_ids(self, extractor):
+        """다른 프로젝트에 같은 세션 ID가 있어도 대화마다 따로 분석"""
+        conversations = [
+            Conversation(
+                session_id="same",
+                project_path=f"/project-{i}",
+                messages=[Message(role="user", content=content)],
+            )
+            for i, content in enumerate(["테스트 실행해줘", "커밋해줘"])
+        ]
+
+        result = extractor.analyze(conversations)
+
+        assert result["repeated_requests"] == {"테스트": 1, "커밋": 1}
+
     def test_extract_edit_patterns(self, extractor, sample_conversations):
         """Edit 패턴 추출 테스트"""
         edit_patterns = extractor.extract_edit_patterns(sample_conversations)
@@ -76,6 +116,31 @@ class TestPatternExtractor:
         assert "recent_edits" in edit_patterns
         assert edit_patterns["total_edits"] >= 1
 
+    def test_extract_edit_patterns_keeps_first_edits(self, extractor):
+        """편집 수와 확장자는 전부 세고 recent_edits는 앞쪽 5개만 유지"""
+        conversations = [
+            Conversation(
+                session_id=f"s{i}", project_path="/test",
+                messages=[Message(
+                    role="assistant", content="",
+                    tool_calls=[
+                        {"name": "Edit", "input": {"file_path": f"f{i}_{j}.py", "old_string": "a" * 300, "new_string": ""}}
+                        for j in range(3)
+                    ],
+                )],
+            )
+            for i in range(4)
+        ]
+
+        edit_patterns = extractor.extract_edit_patterns(conversations)
+
+        assert edit_patterns["total_edits"] == 12
+        assert edit_patterns["by_extension"] == {"py": 12}
+        assert [e["file_path"] for e in edit_patterns["recent_edits"]] == [
+            "f0_0.py", "f0_1.py", "f0_2.py", "f1_0.py", "f1_1.py",
+        ]
+        assert len(edit_patterns["recent_edits"][0]["old_string"]) == 100
+
     def test_extract_workflow_patterns(self, extractor, sample_conversations):
         """워크플로우 패턴 추출 테스트"""
         workflows = extractor.extract_workflow_patterns(sample_conversations)
@@ -107,6 +172,17 @@ class TestPatternExtractor:
         assert "edit_patterns" in result
         assert "workflows" in result
 
+    def test_analyze_generator(self, extractor, sample_conversations):
+        """generator를 넘겨도 개별 추출 결과와 같고 도구 사용 빈도도 집계"""
+        result = extractor.analyze(iter(sample_conversations), tool_top_k=2)
+
+        assert result["corrections"] == extractor.extract_user_corrections(sample_conversations)
+        assert result["repeated_requests"] == extractor.extract_repeated_requests(sample_conversations)
+        assert result["edit_patterns"] == extractor.extract_edit_patterns(sample_conversations)
+        assert result["workflows"] == extractor.extract_workflow_patterns(sample_conversations)
+        assert result["tool_usage"] == {"Write": 1, "Edit": 1}
+        assert result["conversation_count"] == 2
+
 
 class TestPattern:
     """Pattern 데이터클래스 테스트"""
@@ -124,3 +200,4 @@ class TestPattern:
         assert pattern.category == "mistake"
         assert pattern.frequency == 5
         assert len(pattern.examples) == 2
+        assert not hasattr(pattern, "__dict__")